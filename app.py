@@ -1,10 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pathlib import Path
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import json
 import uvicorn
 
-from src.ingestion.ingest_service import ingest_folder
-from src.rag.answer_generator import answer_query
+from src.embeddings.embedder import embeddings
+from src.embeddings.embedding_cache import CachedEmbeddings
+from src.ingestion.job_queue import ingest_jobs
+from src.models.metadata import RetrievalFilters
+from src.rag.answer_generator import (
+    aanswer_query,
+    abatch_answer_queries,
+    answer_cache,
+    astream_answer,
+    batch_config
+)
 from src.utils.logger import get_logger
+from src.vectorstore.collection_versions import ALIAS, gc_versions, list_versions, swap_alias
+from src.vectorstore.connection_pool import pool_stats
+from src.vectorstore.pgvector_store import ann_search_params, init as init_vector_store
 
 from generate_evaluation_dataset import main as generate_eval_dataset
 from run_evaluation import run_evaluation
@@ -17,10 +34,19 @@ logger = get_logger("API", "api.log")
 # --------------------------------
 # FastAPI App
 # --------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Extension, tables and pgvector version; kept out of import time
+    init_vector_store()
+    # Background ingestion worker; picks up jobs interrupted by a restart
+    ingest_jobs.start()
+    yield
+
 app = FastAPI(
     title="LIC GenAI Knowledge Assistant",
     description="Enterprise RAG-based assistant for Life Insurance documents",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # --------------------------------
@@ -28,9 +54,33 @@ app = FastAPI(
 # --------------------------------
 class IngestRequest(BaseModel):
     path: str
+    incremental: bool = True
+
+class ReindexRequest(BaseModel):
+    path: str
+    evaluation_dataset_path: Optional[str] = None
+    min_overall_score: Optional[float] = None   # defaults to vectorstore.versions
+    swap: bool = True
+
+class SwapAliasRequest(BaseModel):
+    collection_name: str
+
+class GcRequest(BaseModel):
+    keep_previous: Optional[int] = Field(None, ge=0)   # defaults to vectorstore.versions
 
 class QueryRequest(BaseModel):
     question: str
+    filters: Optional[RetrievalFilters] = None
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)   # HNSW recall/speed override
+    probes: Optional[int] = Field(None, ge=1)               # IVFFlat recall/speed override
+    extractive: Optional[bool] = None                       # allow the no-LLM lookup path
+
+class BatchQueryRequest(BaseModel):
+    questions: List[str]
+    filters: Optional[RetrievalFilters] = None
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)
+    probes: Optional[int] = Field(None, ge=1)
+    extractive: Optional[bool] = None
 
 class GenerateEvalDatasetRequest(BaseModel):
     base_path: str
@@ -40,54 +90,219 @@ class GenerateEvalDatasetRequest(BaseModel):
 class RunEvaluationRequest(BaseModel):
     evaluation_dataset_path: str
 
+def _vectorstore_filter(filters: Optional[RetrievalFilters]):
+    return filters.to_vectorstore_filter() if filters else None
+
 # --------------------------------
 # Ingestion Endpoint
 # --------------------------------
-@app.post("/ingest")
+@app.post("/ingest", status_code=202)
 def ingest(req: IngestRequest):
     logger.info(f"Received ingestion request for path: {req.path}")
 
+    if not Path(req.path).is_dir():
+        raise HTTPException(status_code=400, detail=f"Not a directory: {req.path}")
+
+    job_id = ingest_jobs.submit(req.path, incremental=req.incremental)
+    logger.info(f"Queued ingestion job {job_id}")
+
+    return {"status": "queued", "job_id": job_id}
+
+
+@app.get("/ingest/{job_id}")
+def ingest_status(job_id: str):
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown ingestion job")
+
+    return job
+
+
+@app.post("/ingest/{job_id}/resume", status_code=202)
+def ingest_resume(job_id: str):
+    if not ingest_jobs.resume(job_id):
+        raise HTTPException(status_code=409, detail="Only failed jobs can be resumed")
+
+    return {"status": "queued", "job_id": job_id}
+
+# --------------------------------
+# Collection Versions (blue/green)
+# --------------------------------
+@app.get("/collections")
+def collections():
+    return {"alias": ALIAS, "versions": list_versions()}
+
+
+@app.post("/collections/reindex", status_code=202)
+def collections_reindex(req: ReindexRequest):
+    logger.info(f"Received re-index request for path: {req.path}")
+
+    if not Path(req.path).is_dir():
+        raise HTTPException(status_code=400, detail=f"Not a directory: {req.path}")
+
+    job_id = ingest_jobs.submit(
+        req.path,
+        kind="reindex",
+        options={
+            "evaluation_dataset_path": req.evaluation_dataset_path,
+            "min_overall_score": req.min_overall_score,
+            "swap": req.swap
+        }
+    )
+    logger.info(f"Queued re-index job {job_id}")
+
+    return {"status": "queued", "job_id": job_id}
+
+
+@app.post("/collections/swap")
+def collections_swap(req: SwapAliasRequest):
+    logger.info(f"Swapping alias {ALIAS} to {req.collection_name}")
+
+    try:
+        previous = swap_alias(req.collection_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"alias": ALIAS, "live": req.collection_name, "previous": previous}
+
+
+@app.post("/collections/gc")
+def collections_gc(req: Optional[GcRequest] = None):
+    # gc also deletes versions newer than the live one - i.e. a build
+    if ingest_jobs.active("reindex"):
+        raise HTTPException(status_code=409, detail="A re-index job is queued or running")
+
+    return {"deleted": gc_versions(keep_previous=req.keep_previous if req else None)}
+
+# --------------------------------
+# Query Endpoint
+# --------------------------------
+@app.post("/query")
+async def query(req: QueryRequest):
+    logger.info(f"Received query request: {req.question}")
+
     try:
-        ingest_folder(req.path)
-        logger.info("Ingestion completed successfully")
+        with ann_search_params(req.ef_search, req.probes):
+            result = await aanswer_query(
+                req.question,
+                filters=_vectorstore_filter(req.filters),
+                extractive=req.extractive
+            )
 
         return {
-            "status": "success",
-            "message": "Ingestion completed successfully"
+            "answer": result['answer'],
+            "context_tokens": result.get("context_tokens", 0),
+            "path": result.get("path")
         }
 
     except Exception as e:
-        logger.error("Ingestion failed")
+        logger.error("Query processing failed")
         logger.error(str(e))
 
         raise HTTPException(
             status_code=500,
-            detail="Ingestion failed. Please check logs for details."
+            detail="Query processing failed. Please try again later."
         )
 
+
 # --------------------------------
-# Query Endpoint
+# Batch Query Endpoint
 # --------------------------------
-@app.post("/query")
-def query(req: QueryRequest):
-    logger.info(f"Received query request: {req.question}")
+@app.post("/query/batch")
+async def query_batch(req: BatchQueryRequest):
+    logger.info(f"Received batch query request: {len(req.questions)} questions")
+
+    if len(req.questions) > batch_config["max_questions"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {batch_config['max_questions']} questions per batch."
+        )
 
     try:
-        result = answer_query(req.question)
+        with ann_search_params(req.ef_search, req.probes):
+            results = await abatch_answer_queries(
+                req.questions,
+                filters=_vectorstore_filter(req.filters),
+                extractive=req.extractive
+            )
 
         return {
-            "answer": result['answer']
+            "results": [
+                {
+                    "question": question,
+                    "answer": result["answer"],
+                    "context_tokens": result.get("context_tokens", 0),
+                    "path": result.get("path"),
+                    "error": result.get("error")
+                }
+                for question, result in zip(req.questions, results)
+            ]
         }
 
     except Exception as e:
-        logger.error("Query processing failed")
+        logger.error("Batch query processing failed")
         logger.error(str(e))
 
         raise HTTPException(
             status_code=500,
             detail="Query processing failed. Please try again later."
         )
-    
+
+
+# --------------------------------
+# Streaming Query Endpoint (SSE)
+# --------------------------------
+@app.post("/query/stream")
+async def query_stream(req: QueryRequest):
+    logger.info(f"Received streaming query request: {req.question}")
+
+    async def events():
+        # Set inside the generator: it runs after the handler has returned
+        with ann_search_params(req.ef_search, req.probes):
+            stream = astream_answer(
+                req.question,
+                _vectorstore_filter(req.filters),
+                req.extractive
+            )
+            async for event, data in stream:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# --------------------------------
+# Embedding Cache Stats
+# --------------------------------
+@app.get("/embedding-cache/stats")
+def embedding_cache_stats():
+    if not isinstance(embeddings, CachedEmbeddings):
+        return {"enabled": False}
+
+    return {"enabled": True, **embeddings.stats()}
+
+
+# --------------------------------
+# Database Pool Stats
+# --------------------------------
+@app.get("/db-pool/stats")
+def db_pool_stats():
+    return pool_stats()
+
+
+# --------------------------------
+# Answer Cache Stats
+# --------------------------------
+@app.get("/answer-cache/stats")
+def answer_cache_stats():
+    if answer_cache is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **answer_cache.stats()}
+
 
 # --------------------------------
 # Generate Evaluation Dataset
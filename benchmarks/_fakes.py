@@ -0,0 +1,23 @@
+"""
+Offline providers for the query benchmarks: the local fake embedder and
+LLM, no answer or embedding cache. Call use_fakes() before importing any
+src module that builds its clients (embedder, llm_client, answer_generator).
+"""
+from typing import Optional
+
+from src.utils.config_loader import load_config
+
+
+def use_fakes(llm_latency: float, embed_latency: Optional[float] = None):
+    """
+    llm_latency / embed_latency: simulated seconds per call
+    (embed_latency=None keeps embedding.fake_latency_seconds)
+    """
+    config = load_config()
+    config["embedding"]["provider"] = "fake"
+    if embed_latency is not None:
+        config["embedding"]["fake_latency_seconds"] = embed_latency
+    config["embedding"]["cache"]["enabled"] = False
+    config["llm"]["provider"] = "fake"
+    config["llm"]["fake_latency_seconds"] = llm_latency
+    config["answer_cache"]["enabled"] = False
@@ -0,0 +1,156 @@
+"""
+ANN index benchmark: recall and latency of HNSW / IVFFlat against exact search.
+
+For every corpus size a scratch table (ann_benchmark, dropped afterwards)
+is filled with clustered random unit vectors - real embeddings cluster by
+topic, uniform noise would understate ANN recall. Exact top-k (sequential
+scan) is the ground truth; the index is then built with the configured
+parameters (vectorstore.index) and queried at several ef_search / probes
+values.
+
+Only the database (PGVECTOR_URL) is needed.
+
+    python -m benchmarks.ann_index --sizes 10000 50000 --index hnsw --ef-search 10 40 100 200
+    python -m benchmarks.ann_index --sizes 10000 50000 --index ivfflat --probes 1 5 10 20
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from src.vectorstore.connection_pool import engine
+from src.vectorstore.pgvector_store import EMBEDDING_DIMENSIONS, index_config
+
+TABLE = "ann_benchmark"
+
+
+# -------------------------------------------------
+# DATA
+# -------------------------------------------------
+
+def clustered_vectors(n: int, dim: int, rng, clusters: int = 100) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    points = centers[rng.integers(0, clusters, n)]
+    points += 0.5 * rng.standard_normal((n, dim), dtype=np.float32)
+    return points / np.linalg.norm(points, axis=1, keepdims=True)
+
+
+def as_literal(vector) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in vector) + "]"
+
+
+def load_table(cursor, vectors: np.ndarray):
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    cursor.execute(f"CREATE TABLE {TABLE} (id int, embedding vector({vectors.shape[1]}))")
+
+    with cursor.copy(f"COPY {TABLE} (id, embedding) FROM STDIN") as copy:
+        for i, vector in enumerate(vectors):
+            copy.write_row((i, as_literal(vector)))
+
+
+# -------------------------------------------------
+# SEARCH
+# -------------------------------------------------
+
+def search(cursor, queries, k: int):
+    results = []
+    latencies = []
+
+    for query in queries:
+        start = time.perf_counter()
+        cursor.execute(
+            f"SELECT id FROM {TABLE} ORDER BY embedding <=> %s::vector LIMIT %s",
+            (query, k)
+        )
+        results.append({row[0] for row in cursor.fetchall()})
+        latencies.append(time.perf_counter() - start)
+
+    return results, statistics.median(latencies) * 1000
+
+
+def recall(found, truth) -> float:
+    return sum(len(f & t) for f, t in zip(found, truth)) / sum(len(t) for t in truth)
+
+
+def build_index(cursor, index: str):
+    if index == "hnsw":
+        cursor.execute(
+            f"CREATE INDEX ON {TABLE} USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {int(index_config['m'])}, "
+            f"ef_construction = {int(index_config['ef_construction'])})"
+        )
+    else:
+        cursor.execute(
+            f"CREATE INDEX ON {TABLE} USING ivfflat (embedding vector_cosine_ops) "
+            f"WITH (lists = {int(index_config['lists'])})"
+        )
+    cursor.execute(f"ANALYZE {TABLE}")
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+def main(sizes, dim: int, index: str, settings, k: int, num_queries: int):
+    rng = np.random.default_rng(0)
+    setting = "hnsw.ef_search" if index == "hnsw" else "ivfflat.probes"
+
+    connection = engine.raw_connection()
+    connection.autocommit = True
+    cursor = connection.cursor()
+
+    print(f"{index}, dim {dim}, top {k}, {num_queries} queries\n")
+    print(f"{'rows':>8} | {setting:>15} | {'recall':>6} | {'p50 ms':>7} | {'exact ms':>8} | {'build s':>7}")
+
+    try:
+        for size in sizes:
+            vectors = clustered_vectors(size, dim, rng)
+            picks = rng.integers(0, size, num_queries)
+            noise = 0.1 * rng.standard_normal((num_queries, dim), dtype=np.float32)
+            queries = [as_literal(v) for v in vectors[picks] + noise]
+
+            load_table(cursor, vectors)
+            cursor.execute(f"ANALYZE {TABLE}")
+
+            truth, exact_ms = search(cursor, queries, k)
+
+            start = time.perf_counter()
+            build_index(cursor, index)
+            build_seconds = time.perf_counter() - start
+
+            for value in settings:
+                cursor.execute(f"SET {setting} = {int(value)}")
+                found, ann_ms = search(cursor, queries, k)
+                print(
+                    f"{size:>8} | {value:>15} | {recall(found, truth):>6.3f} | "
+                    f"{ann_ms:>7.2f} | {exact_ms:>8.2f} | {build_seconds:>7.1f}"
+                )
+    finally:
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        connection.close()
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--index", choices=["hnsw", "ivfflat"], default="hnsw")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 40, 100, 200])
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--k", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    main(
+        args.sizes,
+        args.dim,
+        args.index,
+        args.ef_search if args.index == "hnsw" else args.probes,
+        args.k,
+        args.queries
+    )
@@ -0,0 +1,67 @@
+"""
+Per-question throughput of /query/batch against N sequential /query calls.
+
+"sequential" awaits aanswer_query once per question, the way a client
+looping over /query would; "batch" sends all of them through
+abatch_answer_queries (one embedding call, concurrent searches, bounded
+LLM concurrency).
+
+The LLM and embedder are replaced by the local fakes with a simulated
+round-trip each, so only the database (PGVECTOR_URL, with some ingested
+documents) must be reachable.
+
+    python -m benchmarks.batch_query --questions 50 --llm-latency 1.0 --embed-latency 0.2
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._fakes import use_fakes
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+async def main(num_questions: int, concurrency: int):
+    from src.rag.answer_generator import aanswer_query, abatch_answer_queries
+    from src.vectorstore.pgvector_store import vector_store
+
+    seeds = [d.page_content for d in vector_store.similarity_search("premium", k=20)]
+    if not seeds:
+        raise SystemExit("Collection is empty - ingest some documents first")
+    questions = [seeds[i % len(seeds)] for i in range(num_questions)]
+
+    start = time.perf_counter()
+    sequential = [await aanswer_query(q) for q in questions]
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = await abatch_answer_queries(questions, max_concurrency=concurrency)
+    batch_time = time.perf_counter() - start
+
+    errors = sum(1 for r in batch if r.get("error"))
+    mismatched = sum(
+        1 for a, b in zip(sequential, batch) if a["answer"] != b["answer"]
+    )
+
+    print(f"{'mode':>10} | {'total s':>8} | {'q/sec':>7}")
+    print(f"{'sequential':>10} | {sequential_time:>8.2f} | {num_questions / sequential_time:>7.1f}")
+    print(f"{'batch':>10} | {batch_time:>8.2f} | {num_questions / batch_time:>7.1f}")
+    print(f"\nspeedup: {sequential_time / batch_time:.1f}x  errors: {errors}  mismatched answers: {mismatched}")
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--embed-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    use_fakes(args.llm_latency, args.embed_latency)
+    asyncio.run(main(args.questions, args.concurrency))
@@ -0,0 +1,112 @@
+"""
+Micro-benchmark: per-block cost of the ingestion hot loop.
+
+Compares the previous pydantic Block + ChunkMetadata(...).model_dump()
+path with the slotted Block + shared DocumentInfo + plain-dict metadata.
+
+    python -m benchmarks.block_alloc --blocks 200000
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from src.ingestion.chunk_builder import chunk_metadata
+from src.ingestion.parsed_document import DocumentInfo
+from src.ingestion.pdf_blocks import Block
+
+
+# -------------------------------------------------
+# PREVIOUS REPRESENTATION
+# -------------------------------------------------
+
+class PydanticBlock(BaseModel):
+    type: Literal["paragraph", "table"]
+    content: str
+    page_number: int
+    y: float
+    plan_name: str
+    product_name: str
+    file_name: str
+    source: str
+
+
+class PydanticChunkMetadata(BaseModel):
+    plan_name: str
+    product_name: str
+    file_name: str
+    page_number: int
+    type: Literal["text", "table"]
+    source: str
+
+
+def pydantic_path(n: int, path: Path, texts):
+    plan_name, product_name = path.parent.parent.name, path.parent.name
+    blocks = [
+        PydanticBlock(
+            type="paragraph", content=texts[i % len(texts)], page_number=i // 40 + 1,
+            y=float(i % 40), plan_name=plan_name, product_name=product_name,
+            file_name=path.name, source=str(path)
+        )
+        for i in range(n)
+    ]
+    metas = [
+        PydanticChunkMetadata(
+            plan_name=b.plan_name, product_name=b.product_name, file_name=b.file_name,
+            page_number=b.page_number, type="text", source=b.source
+        ).model_dump()
+        for b in blocks
+    ]
+    return blocks, metas
+
+
+# -------------------------------------------------
+# CURRENT REPRESENTATION
+# -------------------------------------------------
+
+def slotted_path(n: int, path: Path, texts):
+    info = DocumentInfo.from_path(path)
+    blocks = [
+        Block("paragraph", texts[i % len(texts)], i // 40 + 1, float(i % 40), info)
+        for i in range(n)
+    ]
+    metas = [chunk_metadata(b, b.page_number, "text") for b in blocks]
+    return blocks, metas
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+
+def measure(fn, n, path, texts):
+    start = time.perf_counter()
+    fn(n, path, texts)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn(n, path, texts)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return elapsed, current
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    path = Path("documents/lic-plans/Endowment Plans/LIC's New Endowment Plan/sales-brochure.pdf")
+    texts = [f"Minimum age at entry {i} years (last birthday)." for i in range(50)]
+
+    print(f"{'representation':>15} | {'us/block':>8} | {'bytes/block':>11}")
+    for name, fn in [("pydantic", pydantic_path), ("slotted", slotted_path)]:
+        seconds, allocated = measure(fn, args.blocks, path, texts)
+        print(
+            f"{name:>15} | {seconds / args.blocks * 1e6:>8.2f} | "
+            f"{allocated / args.blocks:>11.0f}"
+        )
@@ -0,0 +1,168 @@
+"""
+Vector write throughput: langchain add_embeddings vs multi-row INSERT vs
+the binary COPY writer (replace_documents).
+
+Synthetic chunks with random vectors of the configured dimension are
+written into a scratch collection (bulk_insert_benchmark, deleted
+afterwards), in batches of ingestion.store_batch_size, one transaction per
+"document" of --doc-size chunks. "copy+deferred" wraps the COPY load in
+deferred_indexes(), so its time includes rebuilding the ANN / GIN indexes
+once at the end.
+
+Only the database (PGVECTOR_URL) is needed.
+
+    python -m benchmarks.bulk_insert --rows 20000 --doc-size 500
+"""
+import argparse
+import contextlib
+import time
+from datetime import datetime
+from uuid import uuid4
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_postgres import PGVector
+from sqlalchemy.dialects.postgresql import insert
+
+from src.utils.config_loader import load_config
+from src.vectorstore.connection_pool import engine
+from src.vectorstore.pgvector_store import (
+    EMBEDDING_DIMENSIONS,
+    deferred_indexes,
+    replace_documents,
+    vector_store
+)
+
+config = load_config()
+
+COLLECTION = "bulk_insert_benchmark"
+
+
+# -------------------------------------------------
+# DATA
+# -------------------------------------------------
+
+def make_documents(rows: int, doc_size: int, rng):
+    """
+    Yields (source, [(docs, vectors), ...]) per synthetic document
+    """
+    batch_size = config["ingestion"]["store_batch_size"]
+
+    for start in range(0, rows, doc_size):
+        source = f"/benchmark/doc{start // doc_size}.pdf"
+        count = min(doc_size, rows - start)
+
+        docs = [
+            Document(
+                page_content=f"Synthetic chunk {start + i} " + "premium benefit term " * 40,
+                metadata={
+                    "document_id": str(uuid4()),
+                    "chunk_id": str(uuid4()),
+                    "plan_name": "Benchmark",
+                    "product_name": "Benchmark",
+                    "file_name": source.rsplit("/", 1)[-1],
+                    "page_number": i // 4 + 1,
+                    "type": "text",
+                    "source": source,
+                    "checksum": "benchmark",
+                    "ingested_at": datetime.utcnow().isoformat()
+                }
+            )
+            for i in range(count)
+        ]
+        vectors = rng.standard_normal((count, EMBEDDING_DIMENSIONS), dtype=np.float32).tolist()
+
+        yield source, [
+            (docs[i:i + batch_size], vectors[i:i + batch_size])
+            for i in range(0, count, batch_size)
+        ]
+
+
+# -------------------------------------------------
+# WRITERS
+# -------------------------------------------------
+
+def write_add_embeddings(store, source, batches):
+    for docs, vectors in batches:
+        store.add_embeddings(
+            texts=[d.page_content for d in docs],
+            embeddings=vectors,
+            metadatas=[d.metadata for d in docs],
+            ids=[d.metadata["chunk_id"] for d in docs]
+        )
+
+
+def write_insert(store, source, batches):
+    table = vector_store.EmbeddingStore
+
+    with store._make_sync_session() as session:
+        collection = store.get_collection(session)
+
+        for docs, vectors in batches:
+            session.execute(insert(table).values([
+                {
+                    "id": d.metadata["chunk_id"],
+                    "collection_id": collection.uuid,
+                    "embedding": vector,
+                    "document": d.page_content,
+                    "cmetadata": d.metadata,
+                }
+                for d, vector in zip(docs, vectors)
+            ]))
+
+        session.commit()
+
+
+def write_copy(store, source, batches):
+    replace_documents(source, batches, collection_name=COLLECTION)
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+def run(name, writer, rows: int, doc_size: int, deferred: bool = False):
+    store = PGVector(
+        embeddings=vector_store.embeddings,
+        collection_name=COLLECTION,
+        connection=engine,
+        embedding_length=EMBEDDING_DIMENSIONS,
+        use_jsonb=True
+    )
+
+    # Data generation stays outside the timed section
+    documents = list(make_documents(rows, doc_size, np.random.default_rng(0)))
+
+    try:
+        start = time.perf_counter()
+        with deferred_indexes() if deferred else contextlib.nullcontext():
+            for source, batches in documents:
+                writer(store, source, batches)
+        elapsed = time.perf_counter() - start
+    finally:
+        store.delete_collection()
+
+    print(f"{name:>15} | {rows / elapsed:>9.0f} | {elapsed:>7.2f}")
+
+
+def main(rows: int, doc_size: int):
+    print(f"{rows} rows, dim {EMBEDDING_DIMENSIONS}, {doc_size} chunks per document\n")
+    print(f"{'writer':>15} | {'rows/sec':>9} | {'total s':>7}")
+
+    run("add_embeddings", write_add_embeddings, rows, doc_size)
+    run("insert", write_insert, rows, doc_size)
+    run("copy", write_copy, rows, doc_size)
+    run("copy+deferred", write_copy, rows, doc_size, deferred=True)
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--doc-size", type=int, default=500)
+    args = parser.parse_args()
+
+    main(args.rows, args.doc_size)
@@ -0,0 +1,82 @@
+"""
+Prompt size and retrieval hit rate with and without the context planner
+(dedupe + MMR, src/retrieval/context_planner.py).
+
+For every evaluation question: "raw" is the plain top_k retrieval,
+"planned" retrieves fetch_k candidates and runs the planner. Reports
+chunks and context tokens per question and whether an expected
+(pdf_file, page) survives into the context. No LLM calls; answer quality
+itself is checked with run_evaluation.
+
+    python -m benchmarks.context_planner --dataset evaluation/evaluation_dataset.xlsx
+"""
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+from benchmarks.hybrid_retrieval import expected_pages, first_hit_rank
+from src.embeddings.embedder import embeddings
+from src.rag.answer_generator import build_context
+from src.retrieval.context_planner import FETCH_K, plan_context
+from src.retrieval.retriever import retrieve_relevant_chunks
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+def main(dataset: str):
+    df = pd.read_excel(dataset).dropna(subset=["question", "pdf_file"])
+    rows = df.to_dict("records")
+    if not rows:
+        raise SystemExit("Evaluation dataset is empty")
+
+    query_embeddings = embeddings.embed_documents([r["question"] for r in rows])
+
+    stats = {"raw": [], "planned": []}
+
+    for row, query_embedding in zip(rows, query_embeddings):
+        pages = expected_pages(row["page_number"])
+
+        raw = retrieve_relevant_chunks(row["question"], query_embedding=query_embedding)
+
+        start = time.perf_counter()
+        candidates = retrieve_relevant_chunks(
+            row["question"], k=FETCH_K, query_embedding=query_embedding
+        )
+        planned = plan_context(candidates)
+        planner_ms = (time.perf_counter() - start) * 1000
+
+        for name, chunks, ms in [("raw", raw, None), ("planned", planned, planner_ms)]:
+            _, _, _, context_tokens = build_context(chunks)
+            stats[name].append((
+                len(chunks),
+                context_tokens,
+                first_hit_rank(chunks, row["pdf_file"], pages) is not None,
+                ms
+            ))
+
+    print(f"{len(rows)} questions\n")
+    print(f"{'mode':>8} | {'chunks':>6} | {'ctx tokens':>10} | {'hit':>5} | {'retrieve+plan ms':>16}")
+
+    for name, values in stats.items():
+        chunks, tokens, hits, ms = zip(*values)
+        latency = f"{statistics.median(ms):>16.1f}" if name == "planned" else f"{'':>16}"
+        print(
+            f"{name:>8} | {statistics.mean(chunks):>6.1f} | {statistics.mean(tokens):>10.0f} | "
+            f"{sum(hits) / len(hits):>5.2f} | {latency}"
+        )
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default="evaluation/evaluation_dataset.xlsx")
+    args = parser.parse_args()
+
+    main(args.dataset)
@@ -0,0 +1,52 @@
+"""
+Offline throughput benchmark for the ingestion embedding stage.
+
+Runs EmbeddingStage against the deterministic local fake embedder with a
+simulated per-call latency and reports chunks/sec for several concurrency
+settings.
+
+    python -m benchmarks.embedding_throughput --chunks 5000 --latency 0.2
+"""
+import argparse
+import time
+
+from src.embeddings.embedding_stage import EmbeddingStage
+from src.embeddings.fake_embedder import LocalFakeEmbeddings
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+def run(chunks: int, latency: float, batch_size: int, concurrency: int) -> float:
+    texts = [f"chunk {i} " + "premium rate table row " * 40 for i in range(chunks)]
+    embedder = LocalFakeEmbeddings(size=1536, latency_per_call=latency)
+
+    with EmbeddingStage(
+        embedder,
+        batch_size=batch_size,
+        max_concurrency=concurrency
+    ) as stage:
+        start = time.perf_counter()
+        vectors = stage.embed(texts)
+        elapsed = time.perf_counter() - start
+
+    assert len(vectors) == chunks
+    return chunks / elapsed
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>12} | {'chunks/sec':>10}")
+    for concurrency in [1, 2, 4, 8]:
+        rate = run(args.chunks, args.latency, args.batch_size, concurrency)
+        print(f"{concurrency:>12} | {rate:>10.1f}")
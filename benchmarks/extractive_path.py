@@ -0,0 +1,76 @@
+"""
+Latency of the extractive fast path against the LLM path.
+
+Every question is asked twice through aanswer_query, once with
+extractive=False and once with extractive=True, and the p50 / p95
+latency and the share of answers that took the extractive path are
+reported. The answer cache is disabled so every call does real work.
+
+Questions are taken from stored chunk texts (they retrieve their own
+chunk with near-perfect similarity) unless --dataset points at an
+evaluation dataset. The fake embedder and LLM keep this offline;
+--llm-latency simulates the chat model's response time.
+
+    python -m benchmarks.extractive_path --questions 50 --llm-latency 2.0
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import pandas as pd
+
+from benchmarks._fakes import use_fakes
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+async def main(num_questions: int, dataset: str):
+    from src.rag.answer_generator import aanswer_query
+    from src.vectorstore.pgvector_store import vector_store
+
+    if dataset:
+        questions = pd.read_excel(dataset)["question"].dropna().tolist()[:num_questions]
+    else:
+        seeds = [d.page_content for d in vector_store.similarity_search("premium", k=num_questions)]
+        questions = [seeds[i % len(seeds)] for i in range(num_questions)] if seeds else []
+
+    if not questions:
+        raise SystemExit("No questions - ingest some documents or pass --dataset")
+
+    print(f"{len(questions)} questions\n")
+    print(f"{'mode':>10} | {'p50 ms':>8} | {'p95 ms':>8} | {'extractive':>10}")
+
+    for name, extractive in [("llm", False), ("extractive", True)]:
+        latencies = []
+        fast = 0
+
+        for question in questions:
+            start = time.perf_counter()
+            result = await aanswer_query(question, extractive=extractive)
+            latencies.append((time.perf_counter() - start) * 1000)
+            fast += result.get("path") == "extractive"
+
+        latencies.sort()
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(
+            f"{name:>10} | {statistics.median(latencies):>8.1f} | {p95:>8.1f} | "
+            f"{fast / len(questions):>10.0%}"
+        )
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    parser.add_argument("--dataset", default=None)
+    args = parser.parse_args()
+
+    use_fakes(args.llm_latency)
+    asyncio.run(main(args.questions, args.dataset))
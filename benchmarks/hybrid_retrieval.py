@@ -0,0 +1,104 @@
+"""
+Offline retrieval benchmark: dense-only vs hybrid (dense + full-text, RRF).
+
+For every question of the evaluation dataset (generate_evaluation_dataset.py
+output) a retrieval counts as a hit at k when one of the top k chunks comes
+from the expected pdf_file and, when the dataset lists pages, one of the
+expected pages. Reports recall@k and per-query retrieval latency (the query
+embedding is computed once up front and shared by both modes).
+
+Needs the database (PGVECTOR_URL) with the dataset's documents ingested and
+the configured embedding provider; no LLM calls are made.
+
+    python -m benchmarks.hybrid_retrieval --dataset evaluation/evaluation_dataset.xlsx --k 1 3 5 8
+"""
+import argparse
+import re
+import statistics
+import time
+
+import pandas as pd
+
+from src.embeddings.embedder import embeddings
+from src.retrieval import retriever
+
+
+# -------------------------------------------------
+# GROUND TRUTH
+# -------------------------------------------------
+
+def expected_pages(value) -> set:
+    if pd.isna(value):
+        return set()
+    return {int(p) for p in re.findall(r"\d+", str(value))}
+
+
+def first_hit_rank(chunks, pdf_file: str, pages: set):
+    for rank, (doc, _) in enumerate(chunks, start=1):
+        meta = doc.metadata
+        if meta.get("file_name") != pdf_file:
+            continue
+        if not pages or meta.get("page_number") in pages:
+            return rank
+    return None
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+def evaluate(rows, query_embeddings, hybrid: bool, ks):
+    retriever.hybrid_config["enabled"] = hybrid
+
+    ranks = []
+    latencies = []
+
+    for row, query_embedding in zip(rows, query_embeddings):
+        start = time.perf_counter()
+        chunks = retriever.retrieve_relevant_chunks(
+            row["question"],
+            k=max(ks),
+            query_embedding=query_embedding
+        )
+        latencies.append(time.perf_counter() - start)
+
+        ranks.append(first_hit_rank(chunks, row["pdf_file"], expected_pages(row["page_number"])))
+
+    recall = {
+        k: sum(1 for r in ranks if r is not None and r <= k) / len(ranks)
+        for k in ks
+    }
+    p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+
+    return recall, statistics.median(latencies) * 1000, p95 * 1000
+
+
+def main(dataset: str, ks):
+    df = pd.read_excel(dataset).dropna(subset=["question", "pdf_file"])
+    rows = df.to_dict("records")
+    if not rows:
+        raise SystemExit("Evaluation dataset is empty")
+
+    query_embeddings = embeddings.embed_documents([r["question"] for r in rows])
+
+    header = " | ".join(f"{'R@' + str(k):>6}" for k in ks)
+    print(f"{len(rows)} questions\n")
+    print(f"{'mode':>7} | {header} | {'p50 ms':>7} | {'p95 ms':>7}")
+
+    for name, hybrid in [("dense", False), ("hybrid", True)]:
+        recall, p50, p95 = evaluate(rows, query_embeddings, hybrid, ks)
+        cells = " | ".join(f"{recall[k]:>6.2f}" for k in ks)
+        print(f"{name:>7} | {cells} | {p50:>7.1f} | {p95:>7.1f}")
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default="evaluation/evaluation_dataset.xlsx")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 8])
+    args = parser.parse_args()
+
+    main(args.dataset, sorted(args.k))
@@ -0,0 +1,143 @@
+"""
+Memory benchmark for PDF -> chunks parsing.
+
+Parses synthetic brochures of increasing page count with the whole-document
+path (extract_pdf_blocks + blocks_to_documents, pages cached on the
+ParsedDocument) and with the page-by-page stream ingestion uses
+(iter_pdf_documents), and reports peak memory of each. Every run happens in
+a fresh process, since ru_maxrss only ever grows. Streaming should stay
+flat as documents get longer; the list path grows with them.
+
+    python -m benchmarks.parse_memory --pages 25 50 100 200
+    python -m benchmarks.parse_memory --pages 50 --table-every 0   # text only
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import fitz
+
+from src.ingestion.chunk_builder import blocks_to_documents
+from src.ingestion.parallel_parser import iter_pdf_documents
+from src.ingestion.pdf_blocks import extract_pdf_blocks
+
+
+# -------------------------------------------------
+# SYNTHETIC BROCHURE
+# -------------------------------------------------
+
+def build_brochure_pdf(path: Path, pages: int, table_every: int = 10):
+    """
+    Text pages of benefit paragraphs; every `table_every`-th page (0: none)
+    carries a ruled premium-rate table, so Camelot runs on those
+    """
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_text((40, 40), f"Section {p + 1}: Benefits payable under the plan")
+
+        if table_every and p % table_every == 0:
+            top, row_h, col_w, rows, cols = 60, 20, 65, 20, 8
+            for r in range(rows + 1):
+                page.draw_line((40, top + r * row_h), (40 + cols * col_w, top + r * row_h))
+            for c in range(cols + 1):
+                page.draw_line((40 + c * col_w, top), (40 + c * col_w, top + rows * row_h))
+            for r in range(rows):
+                for c in range(cols):
+                    value = "Age" if r == 0 else f"{(r * 7 + c * 13) % 97 + 10}.{c}"
+                    page.insert_text((44 + c * col_w, top + r * row_h + 14), value, fontsize=8)
+            continue
+
+        for n in range(30):
+            page.insert_text(
+                (40, 70 + n * 24),
+                f"{n + 1}. On death during the policy term, the Sum Assured on Death "
+                f"of Rs. {(p * 31 + n) * 1000} is payable ({p}/{n}).",
+                fontsize=8
+            )
+    doc.save(str(path))
+
+
+# -------------------------------------------------
+# MEASUREMENT (one fresh process per run)
+# -------------------------------------------------
+
+def _max_rss_mb() -> float:
+    # ru_maxrss: kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+def _list_path(pdf: Path) -> int:
+    return len(blocks_to_documents(extract_pdf_blocks(pdf)))
+
+
+def _stream_path(pdf: Path) -> int:
+    return sum(1 for _ in iter_pdf_documents(pdf))
+
+
+MODES = {"list": _list_path, "stream": _stream_path}
+
+
+def _measure(mode: str, pdf: Path, warmup_pdf: Path, conn):
+    # Library start-up (Camelot, OpenCV, tokenizer) is not part of the run
+    MODES[mode](warmup_pdf)
+    rss_before = _max_rss_mb()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = MODES[mode](pdf)
+    elapsed = time.perf_counter() - start
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_peak = _max_rss_mb()
+    conn.send((chunks, elapsed, python_peak / 2 ** 20, rss_peak, rss_peak - rss_before))
+    conn.close()
+
+
+def measure(mode: str, pdf: Path, warmup_pdf: Path):
+    context = multiprocessing.get_context("spawn")
+    parent, child = context.Pipe(duplex=False)
+
+    process = context.Process(target=_measure, args=(mode, pdf, warmup_pdf, child))
+    process.start()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--table-every", type=int, default=10,
+                        help="a ruled table on every n-th page (0: text only)")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    warmup_pdf = tmp / "warmup.pdf"
+    build_brochure_pdf(warmup_pdf, 2, table_every=1 if args.table_every else 0)
+
+    print(
+        f"{'pages':>5} | {'path':>6} | {'chunks':>6} | {'seconds':>7} | "
+        f"{'py peak MB':>10} | {'RSS peak MB':>11} | {'RSS growth MB':>13}"
+    )
+    for pages in args.pages:
+        pdf = tmp / f"brochure_{pages}.pdf"
+        build_brochure_pdf(pdf, pages, args.table_every)
+
+        for mode in MODES:
+            chunks, seconds, python_peak, rss_peak, rss_growth = measure(mode, pdf, warmup_pdf)
+            print(
+                f"{pages:>5} | {mode:>6} | {chunks:>6} | {seconds:>7.2f} | "
+                f"{python_peak:>10.1f} | {rss_peak:>11.1f} | {rss_growth:>13.1f}"
+            )
@@ -0,0 +1,188 @@
+"""
+Quantized vector storage benchmark: full float32 vs halfvec vs bit
+(binary quantization) ANN indexes, each quantized mode re-ranked at full
+precision (vectorstore.index.quantization / rerank_factor).
+
+For every mode the benchmark builds that mode's ANN index on the live
+collection (if missing; it is dropped again afterwards) and reports:
+
+- index size on disk and bytes per stored vector
+- recall@k against exact (brute-force float32) search of the same collection
+- hit@k against the evaluation dataset's expected pdf_file / pages
+  (same definition as benchmarks.hybrid_retrieval)
+- median dense-search latency
+
+The table keeps its float32 vectors in every mode - they are what the
+candidates are re-ranked with - so only the index shrinks.
+
+Needs the database (PGVECTOR_URL, pgvector >= 0.7 for halfvec / bit) with
+the dataset's documents ingested and the configured embedding provider.
+
+    python -m benchmarks.quantization --dataset evaluation/evaluation_dataset.xlsx --k 1 3 5 8 --rerank-factor 4
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, text
+
+from benchmarks.hybrid_retrieval import expected_pages, first_hit_rank
+from src.embeddings.embedder import embeddings
+from src.vectorstore.pgvector_store import (
+    EMBEDDING_DIMENSIONS,
+    dense_search_with_score,
+    ensure_vector_index,
+    index_config,
+    vector_index_name,
+    vector_store
+)
+
+MODES = ("none", "halfvec", "bit")
+
+# pgvector storage per value: 8 byte header + the components
+BYTES_PER_VECTOR = {
+    "none": 8 + 4 * EMBEDDING_DIMENSIONS,
+    "halfvec": 8 + 2 * EMBEDDING_DIMENSIONS,
+    "bit": 8 + EMBEDDING_DIMENSIONS // 8,
+}
+
+
+# -------------------------------------------------
+# GROUND TRUTH
+# -------------------------------------------------
+
+def exact_neighbours(query_embeddings, k: int):
+    """
+    Brute-force cosine top k chunk ids of the live collection per query
+    """
+    store = vector_store.EmbeddingStore
+
+    with vector_store._make_sync_session() as session:
+        collection = vector_store.get_collection(session)
+        rows = session.execute(
+            select(store.id, store.embedding).where(store.collection_id == collection.uuid)
+        ).all()
+
+    ids = [chunk_id for chunk_id, _ in rows]
+    matrix = np.array([vector for _, vector in rows], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    queries = np.array(query_embeddings, dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    top = np.argsort(-(queries @ matrix.T), axis=1)[:, :k]
+    return [[ids[i] for i in row] for row in top], len(ids)
+
+
+# -------------------------------------------------
+# INDEXES
+# -------------------------------------------------
+
+def index_size(name: str):
+    with vector_store._make_sync_session() as session:
+        return session.execute(
+            text("SELECT pg_relation_size(to_regclass(:name))"), {"name": name}
+        ).scalar()
+
+
+def drop_index(name: str):
+    with vector_store._make_sync_session() as session:
+        session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        session.commit()
+
+
+# -------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------
+
+def evaluate(rows, query_embeddings, truth, ks):
+    recall = {k: [] for k in ks}
+    ranks = []
+    latencies = []
+
+    for row, query_embedding, exact in zip(rows, query_embeddings, truth):
+        start = time.perf_counter()
+        chunks = dense_search_with_score(query_embedding, max(ks))
+        latencies.append(time.perf_counter() - start)
+
+        found = [doc.id for doc, _ in chunks]
+        for k in ks:
+            recall[k].append(len(set(found[:k]) & set(exact[:k])) / k)
+
+        ranks.append(first_hit_rank(chunks, row["pdf_file"], expected_pages(row["page_number"])))
+
+    hits = {
+        k: sum(1 for r in ranks if r is not None and r <= k) / len(ranks)
+        for k in ks
+    }
+
+    return (
+        {k: statistics.mean(values) for k, values in recall.items()},
+        hits,
+        statistics.median(latencies) * 1000
+    )
+
+
+def main(dataset: str, ks, modes, rerank_factor: int):
+    df = pd.read_excel(dataset).dropna(subset=["question", "pdf_file"])
+    rows = df.to_dict("records")
+    if not rows:
+        raise SystemExit("Evaluation dataset is empty")
+
+    if rerank_factor:
+        index_config["rerank_factor"] = rerank_factor
+
+    query_embeddings = embeddings.embed_documents([r["question"] for r in rows])
+    truth, chunks = exact_neighbours(query_embeddings, max(ks))
+
+    recall_header = " | ".join(f"{'R@' + str(k):>6}" for k in ks)
+    hit_header = " | ".join(f"{'H@' + str(k):>6}" for k in ks)
+    print(
+        f"{len(rows)} questions, {chunks} chunks, dim {EMBEDDING_DIMENSIONS}, "
+        f"rerank factor {index_config['rerank_factor']}\n"
+        f"R@k: overlap with exact top k, H@k: expected page in top k\n"
+    )
+    print(f"{'mode':>8} | {'index MB':>8} | {'B/vector':>8} | {recall_header} | {hit_header} | {'p50 ms':>7}")
+
+    configured = index_config["quantization"]
+
+    try:
+        for mode in modes:
+            name = vector_index_name(mode)
+            created = index_size(name) is None
+
+            index_config["quantization"] = mode
+            ensure_vector_index(quantization=mode)
+
+            try:
+                size_mb = index_size(name) / 2 ** 20
+                recall, hits, p50 = evaluate(rows, query_embeddings, truth, ks)
+            finally:
+                if created:
+                    drop_index(name)
+
+            recall_cells = " | ".join(f"{recall[k]:>6.3f}" for k in ks)
+            hit_cells = " | ".join(f"{hits[k]:>6.2f}" for k in ks)
+            print(
+                f"{mode:>8} | {size_mb:>8.1f} | {BYTES_PER_VECTOR[mode]:>8} | "
+                f"{recall_cells} | {hit_cells} | {p50:>7.1f}"
+            )
+    finally:
+        index_config["quantization"] = configured
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default="evaluation/evaluation_dataset.xlsx")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 8])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--rerank-factor", type=int)
+    args = parser.parse_args()
+
+    main(args.dataset, sorted(args.k), args.modes, args.rerank_factor)
@@ -0,0 +1,76 @@
+"""
+Concurrent load test for the query path: sync vs async.
+
+"sync" runs answer_query on the threadpool exactly like the previous
+`def` /query handler (Starlette's default limit of 40 threads);
+"async" awaits aanswer_query on the event loop like the current handler.
+
+The LLM and embedder are replaced by the local fakes, so only the
+database (PGVECTOR_URL, with some ingested documents) must be reachable.
+Questions are taken from stored chunk texts so retrieval always finds a
+match and every request reaches the LLM.
+
+    python -m benchmarks.query_load --requests 400 --concurrency 200 --llm-latency 3.0
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import anyio
+
+from benchmarks._fakes import use_fakes
+
+
+# -------------------------------------------------
+# LOAD LOOP
+# -------------------------------------------------
+
+async def run(call, questions, concurrency: int):
+    limiter = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(question):
+        async with limiter:
+            start = time.perf_counter()
+            await call(question)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(q) for q in questions))
+    elapsed = time.perf_counter() - start
+
+    return len(questions) / elapsed, statistics.median(latencies), max(latencies)
+
+
+async def main(requests: int, concurrency: int):
+    from src.rag.answer_generator import aanswer_query, answer_query
+    from src.vectorstore.pgvector_store import vector_store
+
+    seeds = [d.page_content for d in vector_store.similarity_search("premium", k=20)]
+    if not seeds:
+        raise SystemExit("Collection is empty - ingest some documents first")
+    questions = [seeds[i % len(seeds)] for i in range(requests)]
+
+    async def sync_call(question):
+        return await anyio.to_thread.run_sync(answer_query, question)
+
+    print(f"{'path':>6} | {'req/sec':>8} | {'p50 s':>6} | {'max s':>6}")
+    for name, call in [("sync", sync_call), ("async", aanswer_query)]:
+        rate, p50, worst = await run(call, questions, concurrency)
+        print(f"{name:>6} | {rate:>8.1f} | {p50:>6.2f} | {worst:>6.2f}")
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=3.0)
+    args = parser.parse_args()
+
+    use_fakes(args.llm_latency)
+    asyncio.run(main(args.requests, args.concurrency))
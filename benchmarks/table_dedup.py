@@ -0,0 +1,120 @@
+"""
+Benchmark for table/paragraph deduplication in extract_pdf_blocks.
+
+Compares the old per-cell substring scan with the bbox-based check on the
+same Camelot output. Camelot and PyMuPDF text extraction run once per PDF
+and are not part of the timing.
+
+    python -m benchmarks.table_dedup --path documents/lic-plans
+    python -m benchmarks.table_dedup --synthetic 20     # offline premium-rate tables
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+from src.ingestion.parsed_document import ParsedDocument
+from src.ingestion.pdf_blocks import inside_table
+
+
+# -------------------------------------------------
+# SYNTHETIC PREMIUM-RATE PDF
+# -------------------------------------------------
+
+def build_premium_table_pdf(path: Path, pages: int, rows: int = 25, cols: int = 8):
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_text((40, 40), f"Table No. {900 + p}: Tabular premium rates per Rs. 1000 Sum Assured")
+        top, row_h, col_w = 60, 20, 65
+        for r in range(rows + 1):
+            page.draw_line((40, top + r * row_h), (40 + cols * col_w, top + r * row_h))
+        for c in range(cols + 1):
+            page.draw_line((40 + c * col_w, top), (40 + c * col_w, top + rows * row_h))
+        for r in range(rows):
+            for c in range(cols):
+                value = "Age" if r == 0 else f"{(r * 7 + c * 13) % 97 + 10}.{c}"
+                page.insert_text((44 + c * col_w, top + r * row_h + 14), value, fontsize=8)
+        for n in range(12):
+            # footnotes are separate paragraphs, one block each
+            page.insert_text(
+                (40, top + rows * row_h + 30 + n * 22),
+                f"Note {n + 1}: Rates are exclusive of taxes and apply to policy term {10 + n} years."
+            )
+    doc.save(str(path))
+
+
+# -------------------------------------------------
+# DEDUP STRATEGIES
+# -------------------------------------------------
+
+def substring_dedup(parsed, page_no, blocks, tables) -> int:
+    table_texts = set()
+    for t in tables:
+        for row in t.df.values:
+            for cell in row:
+                if isinstance(cell, str):
+                    table_texts.add(" ".join(cell.split()).lower())
+
+    dropped = 0
+    for x0, y0, x1, y1, text, *_ in blocks:
+        cleaned = " ".join(text.split()).lower()
+        if any(t in cleaned for t in table_texts):
+            dropped += 1
+    return dropped
+
+
+def bbox_dedup(parsed, page_no, blocks, tables) -> int:
+    regions = parsed.table_regions(page_no)
+    dropped = 0
+    for x0, y0, x1, y1, text, *_ in blocks:
+        if regions and inside_table(x0, y0, x1, y1, regions):
+            dropped += 1
+    return dropped
+
+
+# -------------------------------------------------
+# MAIN
+# -------------------------------------------------
+
+def benchmark(pdfs):
+    totals = {"substring": [0.0, 0], "bbox": [0.0, 0]}
+
+    for pdf in pdfs:
+        with ParsedDocument(pdf) as parsed:
+            tables_by_page = parsed.tables()
+            pages = [
+                (page_no, parsed.text_blocks(page_no))
+                for page_no in range(1, parsed.page_count + 1)
+            ]
+
+            for name, fn in [("substring", substring_dedup), ("bbox", bbox_dedup)]:
+                start = time.perf_counter()
+                dropped = sum(
+                    fn(parsed, page_no, blocks, tables_by_page.get(page_no, []))
+                    for page_no, blocks in pages
+                )
+                totals[name][0] += time.perf_counter() - start
+                totals[name][1] += dropped
+
+    print(f"{'strategy':>10} | {'seconds':>8} | {'blocks dropped':>14}")
+    for name, (seconds, dropped) in totals.items():
+        print(f"{name:>10} | {seconds:>8.3f} | {dropped:>14}")
+    print(f"speedup: {totals['substring'][0] / max(totals['bbox'][0], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", help="folder of PDFs to benchmark")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="generate a premium-rate PDF with this many pages")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        tmp = Path(tempfile.mkdtemp()) / "premium_rates.pdf"
+        build_premium_table_pdf(tmp, args.synthetic)
+        benchmark([tmp])
+    else:
+        benchmark(sorted(Path(args.path).rglob("*.pdf")))
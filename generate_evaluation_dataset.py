@@ -109,14 +109,14 @@ def main(base_path: str, output_file: str, num_questions: int):
                 )
 
                 llm_response = llm.invoke(prompt)
-                parsed = extract_json_from_llm(llm_response.content)
+                generated = extract_json_from_llm(llm_response.content)
 
-                source = parsed.get("source_documents", [{}])[0]
+                source = generated.get("source_documents", [{}])[0]
 
                 record = {
-                    "question": parsed.get("question"),
-                    "expected_answer": parsed.get("expected_answer"),
-                    "question_type": parsed.get("question_type"),
+                    "question": generated.get("question"),
+                    "expected_answer": generated.get("expected_answer"),
+                    "question_type": generated.get("question_type"),
                     "document_name": source.get("document_name"),
                     "page_number": source.get("page_number"),
                     "pdf_file": pdf.name,
@@ -1,6 +1,8 @@
 from src.ingestion.ingest_service import ingest_folder
+from src.vectorstore.pgvector_store import init as init_vector_store
 
 if __name__ == "__main__":
+    init_vector_store()
     ingest_folder(
         r"C:\Users\anilk\assign2\documents\lic-plans"
     )
@@ -43,7 +43,8 @@ def run_evaluation(input_dataset_path: str):
         try:
             rag_result = answer_query(query)
             llm_answer = rag_result["answer"]
-            retrieval_context = rag_result["retrieval_context"]
+            # No-answer / error results carry no context; still score them
+            retrieval_context = rag_result.get("retrieval_context", "")
 
             eval_prompt = EVALUATOR_PROMPT.format(
                 question=query,
@@ -77,6 +78,8 @@ def run_evaluation(input_dataset_path: str):
 
     print(f"\n✅ Evaluation results saved to: {output_path}")
 
+    return results_df
+
 
 # -------------------------------------------------
 # ENTRY POINT
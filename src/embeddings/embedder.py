@@ -1,11 +1,50 @@
 from dotenv import load_dotenv
 load_dotenv()  # <-- MUST be first
 
+from functools import lru_cache
+
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
+from src.embeddings.embedding_cache import CachedEmbeddings
+from src.embeddings.fake_embedder import LocalFakeEmbeddings
 from src.utils.config_loader import load_config
 
 config = load_config()
 
-embeddings = OpenAIEmbeddings(
-    model=config["embedding"]["model"]
-)
+cache_config = config["embedding"].get("cache", {})
+
+# The model new collection versions are built with (see collection_versions)
+EMBEDDING_PROVIDER = config["embedding"].get("provider", "openai")
+EMBEDDING_MODEL = config["embedding"]["model"]
+EMBEDDING_DIMENSIONS = config["embedding"]["dimensions"]
+
+
+@lru_cache(maxsize=None)
+def embeddings_for(provider: str, model: str, dimensions: int) -> Embeddings:
+    """
+    Embedder of one model, built once per process. Queries against a
+    collection version use the model that built it, which during a
+    blue/green model change differs from the configured one.
+    """
+    if provider == "fake":
+        # Offline runs / benchmarks: no API key, no network
+        base_embeddings = LocalFakeEmbeddings(
+            size=dimensions,
+            latency_per_call=config["embedding"].get("fake_latency_seconds", 0.0)
+        )
+    else:
+        base_embeddings = OpenAIEmbeddings(model=model)
+
+    if not cache_config.get("enabled", False):
+        return base_embeddings
+
+    return CachedEmbeddings(
+        base_embeddings,
+        model_name=f"{provider}:{model}",
+        path=cache_config["path"],
+        max_entries=cache_config["max_entries"]
+    )
+
+
+# Shared by ingestion and query-time embedding (via the vector store)
+embeddings = embeddings_for(EMBEDDING_PROVIDER, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed, SQLite-backed cache in front of an embedder.
+
+    Keys are sha256(model name + chunk text), so identical text is embedded
+    once per model no matter which file / chunking produced it.
+    The cache is bounded to `max_entries` with least-recently-used eviction.
+    """
+
+    def __init__(
+        self,
+        embedder: Embeddings,
+        model_name: str,
+        path: str,
+        max_entries: int = 500_000
+    ):
+        self.embedder = embedder
+        self.model_name = model_name
+        self.max_entries = max_entries
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " vector BLOB NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used "
+            "ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------------
+    # Helpers
+    # -------------------------------
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{self.model_name}\0{text}".encode("utf-8")
+        ).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        unique = list(set(keys))
+
+        with self._lock:
+            # stay well below SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                part = unique[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings "
+                    f"WHERE key IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+        return found
+
+    def _store(self, entries: Dict[str, List[float]]):
+        now = time.time()
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) "
+                "VALUES (?, ?, ?)",
+                [(key, array("f", vec).tobytes(), now) for key, vec in entries.items()]
+            )
+            self._size += self._conn.total_changes - before
+
+            overflow = self._size - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    " SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (overflow,)
+                )
+                self._size -= overflow
+
+            self._conn.commit()
+
+    # -------------------------------
+    # Embeddings interface
+    # -------------------------------
+    def _partition(self, texts: List[str]):
+        """
+        Returns (keys, cached vectors by key, missing texts by key)
+        """
+        keys = [self._key(t) for t in texts]
+        cached = self._lookup(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        return keys, cached, missing
+
+    def _merge(self, texts, keys, cached, missing, vectors) -> List[List[float]]:
+        if missing:
+            fresh = dict(zip(missing.keys(), vectors))
+            self._store(fresh)
+            cached.update(fresh)
+
+        with self._lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+
+        return [cached[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._partition(texts)
+
+        vectors = []
+        if missing:
+            vectors = self.embedder.embed_documents(list(missing.values()))
+
+        return self._merge(texts, keys, cached, missing, vectors)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # SQLite calls (and the wait for self._lock) block, so they run in
+        # a worker thread instead of stalling the event loop
+        keys, cached, missing = await asyncio.to_thread(self._partition, texts)
+
+        vectors = []
+        if missing:
+            vectors = await self.embedder.aembed_documents(list(missing.values()))
+
+        return await asyncio.to_thread(self._merge, texts, keys, cached, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        cached = self._lookup([key])
+
+        if key in cached:
+            with self._lock:
+                self.hits += 1
+            return cached[key]
+
+        vector = self.embedder.embed_query(text)
+        self._store({key: vector})
+
+        with self._lock:
+            self.misses += 1
+
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, cached, missing = await asyncio.to_thread(self._partition, [text])
+
+        vectors = []
+        if missing:
+            vectors = [await self.embedder.aembed_query(text)]
+
+        return (await asyncio.to_thread(self._merge, [text], keys, cached, missing, vectors))[0]
+
+    # -------------------------------
+    # Reporting
+    # -------------------------------
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 4),
+            "entries": self._size,
+            "max_entries": self.max_entries
+        }
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from openai import RateLimitError
+
+from src.utils.logger import get_logger
+
+logger = get_logger("embedding_stage", "ingestion.log")
+
+
+class EmbeddingJob:
+    """
+    Handle for the batches of one submit() call.
+    result() returns the vectors in the order the texts were submitted.
+    """
+
+    def __init__(self, futures: List[Future]):
+        self._futures = futures
+
+    def done(self) -> bool:
+        return all(f.done() for f in self._futures)
+
+    def result(self) -> List[List[float]]:
+        vectors = []
+        for f in self._futures:
+            vectors.extend(f.result())
+        return vectors
+
+
+class EmbeddingStage:
+    """
+    Batched, concurrent embedding stage for ingestion.
+
+    - A batch is closed when it reaches `batch_size` texts or `batch_tokens`
+      tokens, whichever comes first.
+    - At most `max_concurrency` embedding calls are in flight. submit()
+      blocks while every slot is busy, which back-pressures the caller
+      (and through it the parser pool).
+    - Rate-limit errors are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        embedder: Embeddings,
+        batch_size: int = 128,
+        batch_tokens: int = 50000,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        retry_backoff_seconds: float = 1.0,
+        length_function: Optional[Callable[[str], int]] = None
+    ):
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.batch_tokens = batch_tokens
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        # ~4 characters per token is close enough for batching decisions
+        self.length_function = length_function or (lambda text: len(text) // 4 + 1)
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+        self.chunks_embedded = 0
+        self.calls = 0
+        self.retries = 0
+        self._started_at = None
+
+    # -------------------------------
+    # Batching
+    # -------------------------------
+    def _batches(self, texts: List[str]):
+        batch, batch_tokens = [], 0
+
+        for text in texts:
+            tokens = self.length_function(text)
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_tokens + tokens > self.batch_tokens
+            ):
+                yield batch
+                batch, batch_tokens = [], 0
+
+            batch.append(text)
+            batch_tokens += tokens
+
+        if batch:
+            yield batch
+
+    # -------------------------------
+    # Embedding call with retry
+    # -------------------------------
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    vectors = self.embedder.embed_documents(batch)
+                    break
+                except RateLimitError:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self.retry_backoff_seconds * (2 ** attempt)
+                    logger.warning(
+                        f"Embedding rate limited, retrying in {delay:.1f}s "
+                        f"({attempt + 1}/{self.max_retries})"
+                    )
+                    with self._lock:
+                        self.retries += 1
+                    time.sleep(delay)
+
+            with self._lock:
+                self.calls += 1
+                self.chunks_embedded += len(batch)
+
+            return vectors
+
+        finally:
+            self._slots.release()
+
+    # -------------------------------
+    # Public API
+    # -------------------------------
+    def submit(self, texts: List[str]) -> EmbeddingJob:
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+
+        futures = []
+        for batch in self._batches(texts):
+            self._slots.acquire()  # back-pressure: wait for a free slot
+            futures.append(self._pool.submit(self._embed_batch, batch))
+
+        return EmbeddingJob(futures)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.submit(texts).result()
+
+    def throughput(self) -> float:
+        """Chunks embedded per second since the first submit()"""
+        if self._started_at is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._started_at
+        return self.chunks_embedded / elapsed if elapsed > 0 else 0.0
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
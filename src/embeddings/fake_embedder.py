@@ -0,0 +1,22 @@
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+
+class LocalFakeEmbeddings(DeterministicFakeEmbedding):
+    """
+    Deterministic offline embedder (same text -> same vector).
+    Optional sleeps simulate the round-trip of a remote embedding API,
+    so ingestion throughput can be measured without network access.
+    """
+
+    latency_per_call: float = 0.0
+    latency_per_text: float = 0.0
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency_per_call + self.latency_per_text * len(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        time.sleep(self.latency_per_call + self.latency_per_text)
+        return super().embed_query(text)
@@ -1,39 +1,63 @@
 import re
 import tiktoken
-from collections import defaultdict
-from typing import List
+from functools import lru_cache
+from itertools import groupby
+from typing import Iterable, Iterator, List
 from datetime import datetime
 from uuid import uuid4
 
 from bs4 import BeautifulSoup
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
-from pydantic import BaseModel
-from typing import Literal
+
+from src.utils.config_loader import load_config
+
+config = load_config()
 
 # ===============================
 # TOKENIZER
 # ===============================
-enc = tiktoken.encoding_for_model("text-embedding-3-small")
+enc = tiktoken.encoding_for_model(config["embedding"]["model"])
 
-def token_length(text: str) -> int:
+# The recursive splitter measures the same separators and short pieces
+# over and over; memoising those keeps tiktoken off the hot path. Longer
+# texts (merged chunks) are rarely measured twice and would only pin
+# their strings in the cache, so they are always encoded.
+CACHED_TEXT_CHARS = 256
+
+
+def encoded_length(text: str) -> int:
+    """
+    Unmemoised token count, for texts measured once (embedding batches)
+    """
     return len(enc.encode(text))
 
+
+@lru_cache(maxsize=4096)
+def _short_token_length(text: str) -> int:
+    return encoded_length(text)
+
+
+def token_length(text: str) -> int:
+    if len(text) <= CACHED_TEXT_CHARS:
+        return _short_token_length(text)
+    return encoded_length(text)
+
 def get_last_n_tokens(text: str, n=100) -> str:
     tokens = enc.encode(text)
     return enc.decode(tokens[-n:]) if len(tokens) > n else text
 
 
 # ===============================
-# METADATA MODEL
+# METADATA
 # ===============================
-class ChunkMetadata(BaseModel):
-    plan_name: str
-    product_name: str
-    file_name: str
-    page_number: int
-    type: Literal["text", "table"]
-    source: str
+# Plain dicts in the hot loop; the schema (src/models/metadata.ChunkMetadata)
+# is validated once per document at the storage boundary.
+def chunk_metadata(block, page_number: int, chunk_type: str) -> dict:
+    meta = block.doc.as_dict()
+    meta["page_number"] = page_number
+    meta["type"] = chunk_type
+    return meta
 
 
 # ===============================
@@ -63,22 +87,27 @@ def html_table_to_string(html: str) -> str:
 # CORE FUNCTION
 # ===============================
 def blocks_to_documents(blocks) -> List[Document]:
+    # iter_documents expects page order; sorted() is stable within a page
+    return list(iter_documents(sorted(blocks, key=lambda b: b.page_number)))
+
+
+def iter_documents(blocks: Iterable) -> Iterator[Document]:
+    """
+    Streaming version of blocks_to_documents.
+    `blocks` must arrive grouped by page (as iter_pdf_blocks yields them);
+    only one page of blocks is held at a time.
+    """
+    chunking = config["chunking"]
     splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
+        chunk_size=chunking["chunk_size"],
+        chunk_overlap=chunking["chunk_overlap"],
         length_function=token_length
     )
 
-    documents: List[Document] = []
-    pages = defaultdict(list)
-
-    for b in blocks:
-        pages[b.page_number].append(b)
-
     prev_page_tail = None
 
-    for page_no in sorted(pages.keys()):
-        page_blocks = pages[page_no]
+    for page_no, page_group in groupby(blocks, key=lambda b: b.page_number):
+        page_blocks = list(page_group)
         page_text = "\n\n".join(b.content for b in page_blocks)
         clean_text = page_text
 
@@ -86,17 +115,10 @@ def blocks_to_documents(blocks) -> List[Document]:
         for b in page_blocks:
             if b.type == "table":
                 table_text = html_table_to_string(b.content)
-                documents.append(Document(
+                yield Document(
                     page_content=normalize_text(table_text),
-                    metadata=ChunkMetadata(
-                        plan_name=b.plan_name,
-                        product_name=b.product_name,
-                        file_name=b.file_name,
-                        page_number=b.page_number,
-                        type="table",
-                        source=b.source
-                    ).model_dump()
-                ))
+                    metadata=chunk_metadata(b, b.page_number, "table")
+                )
                 clean_text = clean_text.replace(b.content, "")
 
         # TEXT CHUNKS
@@ -108,21 +130,12 @@ def blocks_to_documents(blocks) -> List[Document]:
                 chunk = prev_page_tail + "\n\n" + chunk
 
             meta = page_blocks[0]
-            documents.append(Document(
+            yield Document(
                 page_content=chunk,
-                metadata=ChunkMetadata(
-                    plan_name=meta.plan_name,
-                    product_name=meta.product_name,
-                    file_name=meta.file_name,
-                    page_number=page_no,
-                    type="text",
-                    source=meta.source
-                ).model_dump()
-            ))
+                metadata=chunk_metadata(meta, page_no, "text")
+            )
 
         if chunks:
-            prev_page_tail = get_last_n_tokens(chunks[-1], 100)
+            prev_page_tail = get_last_n_tokens(chunks[-1], chunking["page_overlap_tokens"])
         else:
             prev_page_tail = None
-
-    return documents
@@ -1,40 +1,202 @@
+import contextlib
+import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from uuid import uuid4
 from datetime import datetime
 
-from src.ingestion.pdf_blocks import extract_pdf_blocks
-from src.ingestion.chunk_builder import blocks_to_documents
-from src.vectorstore.pgvector_store import vector_store
+from langchain_core.documents import Document
+
+from src.embeddings.embedder import embeddings
+from src.embeddings.embedding_cache import CachedEmbeddings
+from src.embeddings.embedding_stage import EmbeddingStage
+from src.ingestion.chunk_builder import encoded_length
+from src.ingestion.parallel_parser import parse_pdfs
+from src.vectorstore.pgvector_store import (
+    check_embedding_model,
+    deferred_indexes,
+    ensure_indexes,
+    ensure_vector_index,
+    get_ingested_files,
+    replace_documents
+)
 from src.utils.checksum import file_checksum
+from src.utils.config_loader import load_config
 from src.utils.logger import get_logger
 
 logger = get_logger("ingestion", "ingestion.log")
 
-def ingest_folder(base_path: str):
-    pdfs = list(Path(base_path).rglob("*.pdf"))
+config = load_config()
+
+
+def _build_embedding_stage() -> EmbeddingStage:
+    cfg = config["embedding"]
+    return EmbeddingStage(
+        embeddings,
+        batch_size=cfg["batch_size"],
+        batch_tokens=cfg["batch_tokens"],
+        max_concurrency=cfg["max_concurrency"],
+        max_retries=cfg["max_retries"],
+        retry_backoff_seconds=cfg["retry_backoff_seconds"],
+        length_function=encoded_length
+    )
+
+
+def _embedded_batches(
+    docs: Iterable[Document],
+    stage: EmbeddingStage,
+    batch_size: int,
+    metadata: dict
+) -> Iterator[Tuple[List[Document], List[List[float]]]]:
+    """
+    Cuts a document's chunk stream into bounded batches and embeds them.
+    The next batch is submitted before the current one is handed to the
+    store, so embedding overlaps with the database insert.
+    """
+    docs = iter(docs)
+    pending = deque()
+
+    while True:
+        batch = list(islice(docs, batch_size))
+        if batch:
+            for d in batch:
+                d.metadata.update(metadata, chunk_id=str(uuid4()))
+            pending.append((batch, stage.submit([d.page_content for d in batch])))
+
+        if pending and (len(pending) > 1 or not batch):
+            done, job = pending.popleft()
+            yield done, job.result()
+
+        if not batch and not pending:
+            return
+
+
+def ingest_folder(
+    base_path: str,
+    incremental: bool = True,
+    collection_name: Optional[str] = None,
+    checkpoint=None
+) -> Dict[str, int]:
+    """
+    Ingests every PDF under base_path into the live collection, or into
+    `collection_name` (a version being built, see reindex).
+    In incremental mode files whose stored checksum is unchanged are skipped;
+    changed files have their chunks replaced atomically.
+
+    Pipeline: parser process pool -> bounded chunk batches -> batched
+    concurrent embedding stage -> store. Each stage blocks when the next
+    one falls behind, so memory stays bounded regardless of document length.
+
+    `checkpoint` (a job_queue.JobCheckpoint) records every stored file;
+    files it already holds with the same checksum are not ingested again,
+    so a restarted job resumes where it stopped. With a checkpoint a file
+    that fails is recorded and the rest still run; without one the first
+    failure aborts the ingestion. A collection built with another embedding
+    model than the configured one is refused (check_embedding_model).
+    """
+    check_embedding_model(collection_name)
+
+    # Absolute, symlink-free paths: every file is stored, looked up and
+    # checkpointed under one key however base_path was spelled
+    pdfs = list(dict.fromkeys(pdf.resolve() for pdf in Path(base_path).rglob("*.pdf")))
 
     logger.info(f"Found {len(pdfs)} PDFs")
 
-    for pdf in pdfs:
-        logger.info(f"Processing: {pdf}")
+    # Full-text + metadata filter indexes; no-op once they exist.
+    # A full rebuild drops the costly ones and builds them after loading.
+    if incremental:
+        ensure_indexes()
+
+    stored = get_ingested_files(collection_name)
+    stats = {"added": 0, "replaced": 0, "skipped": 0, "failed": 0}
 
+    completed = checkpoint.completed() if checkpoint else {}
+    unchanged = []
+
+    checksums = {}
+    for pdf in pdfs:
         checksum = file_checksum(pdf)
-        document_id = uuid4()
-        ingested_at = datetime.utcnow()
+        versions = stored.get(str(pdf), set())
+
+        if completed.get(str(pdf)) == checksum:
+            logger.info(f"Already ingested by this job: {pdf}")
+            continue
+
+        # Exactly one stored copy with the same checksum -> nothing to do
+        if incremental and len(versions) == 1 and next(iter(versions))[0] == checksum:
+            logger.info(f"Skipping unchanged: {pdf}")
+            stats["skipped"] += 1
+            unchanged.append(str(pdf))
+            continue
+
+        checksums[pdf] = checksum
+
+    if checkpoint:
+        checkpoint.plan({str(pdf): c for pdf, c in checksums.items()}, unchanged)
+
+    parsed = parse_pdfs(
+        checksums.keys(),
+        workers=config["ingestion"]["workers"],
+        queue_size=config["ingestion"]["queue_size"],
+        page_buffer=config["ingestion"]["page_buffer"]
+    )
+
+    rebuild = contextlib.nullcontext() if incremental else deferred_indexes()
 
-        blocks = extract_pdf_blocks(pdf)
-        docs = blocks_to_documents(blocks)
+    with rebuild, _build_embedding_stage() as stage:
+        for pdf, docs in parsed:
+            logger.info(f"Processing: {pdf}")
+            start = time.perf_counter()
 
-        for d in docs:
-            d.metadata.update({
-                "document_id": str(document_id),
-                "chunk_id": str(uuid4()),
-                "checksum": checksum,
-                "ingested_at": ingested_at.isoformat()
-            })
+            metadata = {
+                "document_id": str(uuid4()),
+                "checksum": checksums[pdf],
+                "ingested_at": datetime.utcnow().isoformat()
+            }
 
-        vector_store.add_documents(docs)
+            try:
+                removed, added = replace_documents(
+                    str(pdf),
+                    _embedded_batches(
+                        docs, stage, config["ingestion"]["store_batch_size"], metadata
+                    ),
+                    collection_name=collection_name
+                )
+            except Exception as e:
+                if checkpoint is None:
+                    raise
+                logger.error(f"Failed to ingest {pdf}: {e}")
+                checkpoint.file_failed(str(pdf), str(e))
+                stats["failed"] += 1
+                continue
+
+            stats["replaced" if str(pdf) in stored else "added"] += 1
+
+            if checkpoint:
+                checkpoint.file_done(str(pdf), added, removed, time.perf_counter() - start)
+
+            logger.info(
+                f"Uploaded {added} chunks for {pdf.name} "
+                f"(removed {removed} stale chunks)"
+            )
 
         logger.info(
-            f"Uploaded {len(docs)} chunks for {pdf.name}"
+            f"Embedded {stage.chunks_embedded} chunks in {stage.calls} calls "
+            f"({stage.throughput():.1f} chunks/sec, {stage.retries} rate-limit retries)"
         )
+
+    # After loading, so IVFFlat trains its lists on real data; no-op once built
+    ensure_vector_index()
+
+    if isinstance(embeddings, CachedEmbeddings):
+        logger.info(f"Embedding cache: {embeddings.stats()}")
+
+    logger.info(
+        f"Ingestion summary: {stats['added']} added, "
+        f"{stats['replaced']} replaced, {stats['skipped']} skipped, "
+        f"{stats['failed']} failed"
+    )
+
+    return stats
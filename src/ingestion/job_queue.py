@@ -0,0 +1,384 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from src.ingestion.ingest_service import ingest_folder
+from src.ingestion.reindex import reindex
+from src.vectorstore.collection_versions import create_version
+from src.utils.config_loader import load_config
+from src.utils.logger import get_logger
+
+logger = get_logger("INGEST_JOBS", "ingestion.log")
+
+config = load_config()
+
+jobs_config = config["ingestion"]["jobs"]
+
+
+class JobCheckpoint:
+    """
+    Per-file progress of one job, written by ingest_folder as it goes
+    """
+
+    def __init__(self, queue: "IngestJobQueue", job_id: str):
+        self.queue = queue
+        self.job_id = job_id
+
+    def completed(self) -> Dict[str, str]:
+        """
+        path -> checksum of the files this job has already stored
+        """
+        return dict(self.queue._fetchall(
+            "SELECT path, checksum FROM job_files WHERE job_id = ? AND status = 'done'",
+            (self.job_id,)
+        ))
+
+    def plan(self, pending: Dict[str, str], skipped: List[str]):
+        """
+        Registers the files this run will ingest (path -> checksum) and the
+        ones skipped as unchanged. Files that failed in an earlier run, or
+        changed since, go back to pending.
+        """
+        self.queue._executemany(
+            "INSERT INTO job_files (job_id, path, checksum, status) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (job_id, path) DO UPDATE SET "
+            " checksum = excluded.checksum, status = excluded.status, error = NULL",
+            [(self.job_id, path, checksum, "pending") for path, checksum in pending.items()]
+            + [(self.job_id, path, None, "skipped") for path in skipped]
+        )
+
+    def file_done(self, path: str, chunks: int, removed: int, seconds: float):
+        self.queue._execute(
+            "UPDATE job_files SET status = 'done', chunks = ?, removed = ?, seconds = ?, "
+            "error = NULL WHERE job_id = ? AND path = ?",
+            (chunks, removed, seconds, self.job_id, path)
+        )
+
+    def file_failed(self, path: str, error: str):
+        self.queue._execute(
+            "UPDATE job_files SET status = 'failed', error = ? WHERE job_id = ? AND path = ?",
+            (error, self.job_id, path)
+        )
+
+
+class IngestJobQueue:
+    """
+    SQLite-backed queue of ingestion jobs - "ingest" (ingest_folder) or
+    "reindex" (blue/green re-index) - run one at a time by a single
+    background worker thread per process; no broker needed.
+
+    Several processes (uvicorn workers) may share one queue file: a job is
+    claimed in a single UPDATE, and its owner renews a lease (heartbeat)
+    while running it. Jobs and their per-file checkpoints survive restarts:
+    a running job whose lease expired - its process died - is queued again
+    and skips the files it had already stored.
+    """
+
+    def __init__(self, path: str, poll_seconds: float = 5.0, lease_seconds: float = 60.0):
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL DEFAULT 'ingest',"   # ingest | reindex
+            " options TEXT,"                  # JSON keyword arguments of the kind
+            " path TEXT NOT NULL,"
+            " incremental INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"          # queued | running | succeeded | failed
+            " error TEXT,"
+            " stats TEXT,"
+            " created_at TEXT NOT NULL,"
+            " started_at TEXT,"
+            " finished_at TEXT,"
+            " owner TEXT,"                    # worker running the job
+            " heartbeat_at REAL)"             # owner's last lease renewal (epoch)
+        )
+        # Queue files created before leases / job kinds
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column in (
+            "owner TEXT",
+            "heartbeat_at REAL",
+            "kind TEXT NOT NULL DEFAULT 'ingest'",
+            "options TEXT"
+        ):
+            if column.split()[0] not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_files ("
+            " job_id TEXT NOT NULL,"
+            " path TEXT NOT NULL,"
+            " checksum TEXT,"
+            " status TEXT NOT NULL,"          # pending | done | failed | skipped
+            " chunks INTEGER,"
+            " removed INTEGER,"
+            " seconds REAL,"
+            " error TEXT,"
+            " PRIMARY KEY (job_id, path))"
+        )
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+        self._running_job = None
+
+    # -------------------------------
+    # Helpers
+    # -------------------------------
+    def _execute(self, sql: str, params=()) -> int:
+        with self._lock:
+            rowcount = self._conn.execute(sql, params).rowcount
+            self._conn.commit()
+        return rowcount
+
+    def _executemany(self, sql: str, rows):
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+
+    def _fetchall(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # -------------------------------
+    # Jobs
+    # -------------------------------
+    def submit(
+        self,
+        path: str,
+        incremental: bool = True,
+        kind: str = "ingest",
+        options: Optional[dict] = None
+    ) -> str:
+        job_id = uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, kind, options, path, incremental, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+            (
+                job_id,
+                kind,
+                json.dumps(options or {}),
+                path,
+                int(incremental),
+                datetime.utcnow().isoformat()
+            )
+        )
+        self._wakeup.set()
+        return job_id
+
+    def active(self, kind: str) -> bool:
+        """
+        True while a job of this kind is queued or running
+        """
+        return bool(self._fetchall(
+            "SELECT 1 FROM jobs WHERE kind = ? AND status IN ('queued', 'running') LIMIT 1",
+            (kind,)
+        ))
+
+    def resume(self, job_id: str) -> bool:
+        """
+        Queues a failed job again; it retries only the files not yet stored
+        """
+        resumed = self._execute(
+            "UPDATE jobs SET status = 'queued', error = NULL "
+            "WHERE id = ? AND status = 'failed'",
+            (job_id,)
+        )
+        self._wakeup.set()
+        return bool(resumed)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Job status with per-file progress, throughput and errors
+        """
+        rows = self._fetchall(
+            "SELECT kind, options, path, incremental, status, error, stats, created_at, "
+            "started_at, finished_at FROM jobs WHERE id = ?",
+            (job_id,)
+        )
+        if not rows:
+            return None
+
+        (
+            kind, options, path, incremental, status, error, stats,
+            created_at, started_at, finished_at
+        ) = rows[0]
+
+        files = [
+            {"path": p, "status": s, "chunks": c, "seconds": round(t, 2) if t else None, "error": e}
+            for p, s, c, t, e in self._fetchall(
+                "SELECT path, status, chunks, seconds, error FROM job_files "
+                "WHERE job_id = ? ORDER BY rowid",
+                (job_id,)
+            )
+        ]
+
+        progress = {"files_total": len(files)}
+        for state in ("done", "pending", "failed", "skipped"):
+            progress[f"files_{state}"] = sum(f["status"] == state for f in files)
+
+        chunks = sum(f["chunks"] or 0 for f in files)
+        seconds = sum(f["seconds"] or 0 for f in files)
+
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "options": json.loads(options) if options else {},
+            "path": path,
+            "incremental": bool(incremental),
+            "status": status,
+            "error": error,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "progress": progress,
+            "chunks": chunks,
+            "chunks_per_second": round(chunks / seconds, 1) if seconds else 0.0,
+            "stats": json.loads(stats) if stats else None,
+            "errors": [{"path": f["path"], "error": f["error"]} for f in files if f["error"]],
+            "files": files
+        }
+
+    # -------------------------------
+    # Worker
+    # -------------------------------
+    def start(self):
+        """
+        Starts the worker and heartbeat threads (once per process)
+        """
+        if self._worker is not None:
+            return
+
+        self._worker = threading.Thread(target=self._run, name="ingest-jobs", daemon=True)
+        self._worker.start()
+
+        threading.Thread(target=self._heartbeat, name="ingest-jobs-lease", daemon=True).start()
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            job_id = self._running_job
+            if not job_id:
+                continue
+
+            # A failed renewal (e.g. "database is locked") must not end the
+            # thread: the lease would expire and another worker re-run the job
+            try:
+                self._execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND owner = ?",
+                    (time.time(), job_id, self.owner)
+                )
+            except Exception as e:
+                logger.error(f"Lease renewal of job {job_id} failed: {e}")
+
+    def _claim(self):
+        """
+        Re-queues running jobs whose lease expired, then claims the oldest
+        queued job in one statement, so two workers can never claim the
+        same job
+        """
+        now = time.time()
+
+        with self._lock:
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL "
+                "WHERE status = 'running' AND COALESCE(heartbeat_at, 0) < ?",
+                (now - self.lease_seconds,)
+            ).rowcount
+
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat_at = ?, "
+                "started_at = COALESCE(started_at, ?) "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' "
+                "            ORDER BY created_at LIMIT 1) "
+                "AND status = 'queued' "
+                "RETURNING id, kind, options, path, incremental",
+                (self.owner, now, datetime.utcnow().isoformat())
+            ).fetchone()
+            self._conn.commit()
+
+        if requeued:
+            logger.info(f"Re-queued {requeued} ingestion job(s) with an expired lease")
+
+        return row
+
+    def _finish(self, job_id: str, status: str, error: Optional[str] = None, stats=None):
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, stats = ?, finished_at = ?, owner = NULL "
+            "WHERE id = ? AND owner = ?",
+            (
+                status,
+                error,
+                json.dumps(stats) if stats else None,
+                datetime.utcnow().isoformat(),
+                job_id,
+                self.owner
+            )
+        )
+
+    def _execute_job(self, job_id: str, kind: str, options: dict, path: str, incremental: bool):
+        """
+        Runs one job; returns (stats, error - None on success)
+        """
+        checkpoint = JobCheckpoint(self, job_id)
+
+        if kind == "reindex":
+            if not options.get("collection_name"):
+                # Remembered, so a resumed job keeps building the same version
+                options["collection_name"] = create_version()
+                self._execute(
+                    "UPDATE jobs SET options = ? WHERE id = ?",
+                    (json.dumps(options), job_id)
+                )
+
+            report = reindex(path, checkpoint=checkpoint, **options)
+            return report, report.get("rejected")
+
+        stats = ingest_folder(path, incremental=incremental, checkpoint=checkpoint)
+        return stats, f"{stats['failed']} file(s) failed" if stats["failed"] else None
+
+    def _run(self):
+        while True:
+            job = self._claim()
+            if job is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+
+            job_id, kind, options, path, incremental = job
+            logger.info(f"Running {kind} job {job_id}: {path}")
+            self._running_job = job_id
+
+            try:
+                stats, error = self._execute_job(
+                    job_id, kind, json.loads(options or "{}"), path, bool(incremental)
+                )
+            except Exception as e:
+                logger.error(f"{kind} job {job_id} failed: {e}")
+                logger.error(traceback.format_exc())
+                self._finish(job_id, "failed", str(e))
+                continue
+            finally:
+                self._running_job = None
+
+            self._finish(job_id, "failed" if error else "succeeded", error, stats)
+            logger.info(f"{kind} job {job_id} finished: {stats}")
+
+ingest_jobs = IngestJobQueue(
+    jobs_config["path"],
+    poll_seconds=jobs_config["poll_seconds"],
+    lease_seconds=jobs_config["lease_seconds"]
+)
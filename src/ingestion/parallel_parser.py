@@ -0,0 +1,134 @@
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import groupby, islice
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+from langchain_core.documents import Document
+
+from src.ingestion.parsed_document import ParsedDocument
+from src.ingestion.pdf_blocks import iter_pdf_blocks
+from src.ingestion.chunk_builder import iter_documents
+
+# NOTE: this module is imported by the worker processes, so it must not
+# pull in the vector store / embedder. Spawned workers also re-import the
+# parent's entry script (app.py, main_ingest.py), so the vector store only
+# connects in pgvector_store.init(), never at import time.
+
+# Workers are spawned, not forked: ingestion runs on a background thread of
+# the API process, and a fork would copy locks held by its other threads
+# (logging, embedding, event loop) and can hang the child.
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def iter_pdf_documents(pdf: Path) -> Iterator[Document]:
+    """PDF -> pages -> blocks -> chunks, one page at a time"""
+    with ParsedDocument(pdf, cache_pages=False) as parsed:
+        yield from iter_documents(iter_pdf_blocks(parsed))
+
+
+# Sent after a file's last page
+_DONE = None
+
+
+def stream_pdf(pdf: Path, pages) -> None:
+    """
+    Pool task: puts the file's chunks on the bounded `pages` queue, one
+    list per page, then _DONE. Blocks while the queue is full, so a worker
+    never runs more than the queue's size ahead of the consumer.
+    """
+    try:
+        for _, docs in groupby(
+            iter_pdf_documents(pdf), key=lambda doc: doc.metadata.get("page_number")
+        ):
+            pages.put(list(docs))
+    finally:
+        pages.put(_DONE)
+
+
+def _streamed(pages, future: Future) -> Iterator[Document]:
+    while True:
+        try:
+            batch = pages.get(timeout=1)
+        except queue.Empty:
+            if future.done():
+                # The worker died without sending _DONE (e.g. killed)
+                future.result()
+                return
+            continue
+
+        if batch is _DONE:
+            # Re-raises the worker's parse error, if any
+            future.result()
+            return
+
+        yield from batch
+
+
+def _drain(pages, future: Future):
+    # Unblocks a worker whose pages were not (all) consumed, so it finishes
+    while not future.done():
+        try:
+            pages.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+def parse_pdfs(
+    pdfs: Iterable[Path],
+    workers: int = 1,
+    queue_size: int = 8,
+    page_buffer: int = 4
+) -> Iterator[Tuple[Path, Iterable[Document]]]:
+    """
+    Yields (pdf, documents) per file, in order; `documents` is a lazy
+    generator and must be consumed before the next file is requested.
+
+    With workers > 1 parsing is fanned out over a process pool: up to
+    `queue_size` files are parsed ahead of the consumer, each streaming its
+    chunks page by page through a queue bounded to `page_buffer` pages. A
+    worker waits once its queue is full, so at most about
+    queue_size * page_buffer pages of chunks are held at a time, however
+    large the files. A new file is only submitted once the consumer has
+    finished one.
+
+    Either way a file that fails to parse raises when its `documents` are
+    consumed, so the caller can tell which file failed and carry on.
+    """
+    if workers <= 1:
+        for pdf in pdfs:
+            yield pdf, iter_pdf_documents(pdf)
+        return
+
+    pdf_iter = iter(pdfs)
+    pending = deque()
+
+    # Manager queues can be handed to pool tasks; plain ones only to children
+    # at start-up. The pool is shut down first, while its queues still work.
+    with _MP_CONTEXT.Manager() as manager, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as pool:
+
+        def submit(pdf: Path):
+            pages = manager.Queue(maxsize=page_buffer)
+            pending.append((pdf, pool.submit(stream_pdf, pdf, pages), pages))
+
+        for pdf in islice(pdf_iter, max(queue_size, workers)):
+            submit(pdf)
+
+        try:
+            while pending:
+                pdf, future, pages = pending[0]
+                yield pdf, _streamed(pages, future)
+
+                _drain(pages, future)
+                pending.popleft()
+
+                for next_pdf in islice(pdf_iter, 1):
+                    submit(next_pdf)
+        finally:
+            # Consumer stopped early: release the workers still streaming
+            for _, future, pages in pending:
+                future.cancel()
+                _drain(pages, future)
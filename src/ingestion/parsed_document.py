@@ -0,0 +1,209 @@
+import mmap
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import camelot
+import fitz  # PyMuPDF
+
+from src.utils.logger import get_logger
+
+logger = get_logger("parsed_document", "ingestion.log")
+
+
+# A lattice table needs a grid: at least this many horizontal
+# and vertical ruling lines on the page before Camelot is worth running
+MIN_RULING_LINES = 2
+
+# Drawn segments / rectangles thinner than this (pt) count as a ruling line
+RULING_LINE_MAX_THICKNESS = 2.0
+
+
+def has_ruling_lines(page: fitz.Page) -> bool:
+    """
+    Cheap lattice-table test on the page's vector paths:
+    counts horizontal and vertical strokes (lines, thin rectangles, cell borders).
+    """
+    horizontal = vertical = 0
+
+    for path in page.get_drawings():
+        for item in path["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) <= RULING_LINE_MAX_THICKNESS:
+                    horizontal += 1
+                elif abs(p1.x - p2.x) <= RULING_LINE_MAX_THICKNESS:
+                    vertical += 1
+            elif item[0] == "re":
+                rect = item[1]
+                if rect.height <= RULING_LINE_MAX_THICKNESS:
+                    horizontal += 1
+                elif rect.width <= RULING_LINE_MAX_THICKNESS:
+                    vertical += 1
+                else:
+                    # Bordered cell; a lone box (callout, frame) stays below the threshold
+                    horizontal += 1
+                    vertical += 1
+
+            if horizontal >= MIN_RULING_LINES and vertical >= MIN_RULING_LINES:
+                return True
+
+    return False
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentInfo:
+    """
+    Per-document metadata, built once and shared by reference by every
+    block and chunk of the document. Strings are interned so documents of
+    the same plan/product share them too.
+    """
+    plan_name: str
+    product_name: str
+    file_name: str
+    source: str
+
+    @classmethod
+    def from_path(cls, pdf_path: Path) -> "DocumentInfo":
+        return cls(
+            plan_name=sys.intern(pdf_path.parent.parent.name),
+            product_name=sys.intern(pdf_path.parent.name),
+            file_name=pdf_path.name,
+            source=str(pdf_path)
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "plan_name": self.plan_name,
+            "product_name": self.product_name,
+            "file_name": self.file_name,
+            "source": self.source
+        }
+
+
+class ParsedDocument:
+    """
+    A PDF opened once and shared by every consumer
+    (ingestion, evaluation dataset generation, re-chunking).
+
+    The file is memory-mapped and PyMuPDF reads straight from the mapping.
+    Page text, text blocks, table pages and Camelot tables are computed
+    lazily, page by page, and cached, so each is derived at most once per
+    document. Streaming consumers that visit each page once can pass
+    cache_pages=False so per-page text and tables do not accumulate.
+    """
+
+    def __init__(self, pdf_path: Path, cache_pages: bool = True):
+        self.path = Path(pdf_path)
+        self.info = DocumentInfo.from_path(self.path)
+        self.file_name = self.info.file_name
+        self.source = self.info.source
+        self.cache_pages = cache_pages
+
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.doc = fitz.open(stream=self._view, filetype="pdf")
+
+        self._text: Dict[int, str] = {}
+        self._text_blocks: Dict[int, list] = {}
+        self._table_pages = None
+        self._tables: Dict[int, list] = {}
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    def page(self, page_no: int) -> fitz.Page:
+        return self.doc[page_no - 1]
+
+    # -------------------------------
+    # Cached per-page data (1-based page numbers)
+    # -------------------------------
+    def page_text(self, page_no: int) -> str:
+        if page_no in self._text:
+            return self._text[page_no]
+
+        text = self.page(page_no).get_text()
+        if self.cache_pages:
+            self._text[page_no] = text
+        return text
+
+    def text_blocks(self, page_no: int) -> list:
+        if page_no in self._text_blocks:
+            return self._text_blocks[page_no]
+
+        blocks = self.page(page_no).get_text("blocks")
+        if self.cache_pages:
+            self._text_blocks[page_no] = blocks
+        return blocks
+
+    def table_pages(self) -> List[int]:
+        """Pages with a drawn grid - the only ones that can hold a lattice table"""
+        if self._table_pages is None:
+            self._table_pages = [
+                page_index + 1
+                for page_index, page in enumerate(self.doc)
+                if has_ruling_lines(page)
+            ]
+            logger.info(
+                f"{self.file_name}: Camelot runs on {len(self._table_pages)}/{self.page_count} "
+                f"pages ({self.page_count - len(self._table_pages)} skipped)"
+            )
+        return self._table_pages
+
+    def page_tables(self, page_no: int) -> list:
+        """Camelot lattice tables of one page, run only on table pages"""
+        if page_no in self._tables:
+            return self._tables[page_no]
+
+        tables = []
+        if page_no in self.table_pages():
+            # Camelot opens the file itself, but only splits out this page
+            tables = list(camelot.read_pdf(self.source, pages=str(page_no), flavor="lattice"))
+
+        if self.cache_pages:
+            self._tables[page_no] = tables
+        return tables
+
+    def tables(self) -> Dict[int, list]:
+        """Camelot lattice tables of every table page, by page"""
+        return {page_no: self.page_tables(page_no) for page_no in self.table_pages()}
+
+    def table_regions(
+        self,
+        page_no: int,
+        tables: Optional[list] = None
+    ) -> List[Tuple[float, float, float, float]]:
+        """
+        Camelot bboxes are in PDF space (origin bottom-left);
+        map them into PyMuPDF page space (origin top-left).
+        Pass the page's `tables` when already at hand.
+        """
+        if tables is None:
+            tables = self.page_tables(page_no)
+        if not tables:
+            return []
+
+        matrix = self.page(page_no).transformation_matrix
+        return [tuple(fitz.Rect(t._bbox) * matrix) for t in tables]
+
+    # -------------------------------
+    # Lifecycle
+    # -------------------------------
+    def close(self):
+        if self.doc is None:
+            return
+        # The mapping can only be closed once nothing references it
+        self.doc.close()
+        self.doc = None
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
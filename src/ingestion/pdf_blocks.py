@@ -1,83 +1,99 @@
-import fitz  # PyMuPDF
-import camelot
+from dataclasses import dataclass
 from pathlib import Path
-from collections import defaultdict
-from typing import List
-from pydantic import BaseModel
-from typing import Literal
+from typing import Iterator, List, Union
 
+from src.ingestion.parsed_document import DocumentInfo, ParsedDocument
 
-class Block(BaseModel):
-    type: Literal["paragraph", "table"]
+
+# Share of a text block's area that must lie inside a table region
+# for the block to be treated as part of that table
+TABLE_OVERLAP_RATIO = 0.5
+
+
+@dataclass(slots=True)
+class Block:
+    """
+    Internal ingestion record - a plain slotted dataclass, no validation.
+    Document metadata lives on the shared `doc` object instead of being
+    copied into every block.
+    """
+    type: str  # "paragraph" | "table"
     content: str
     page_number: int
     y: float
-    plan_name: str
-    product_name: str
-    file_name: str
-    source: str
+    doc: DocumentInfo
+
+    @property
+    def plan_name(self) -> str:
+        return self.doc.plan_name
+
+    @property
+    def product_name(self) -> str:
+        return self.doc.product_name
+
+    @property
+    def file_name(self) -> str:
+        return self.doc.file_name
 
+    @property
+    def source(self) -> str:
+        return self.doc.source
 
-def extract_pdf_blocks(pdf_path: Path) -> List[Block]:
-    plan_name = pdf_path.parent.parent.name
-    product_name = pdf_path.parent.name
-    file_name = pdf_path.name
-    source = str(pdf_path)
 
-    tables = camelot.read_pdf(str(pdf_path), pages="all", flavor="lattice")
+def inside_table(x0: float, y0: float, x1: float, y1: float, regions) -> bool:
+    area = (x1 - x0) * (y1 - y0)
 
-    tables_by_page = defaultdict(list)
-    table_text_by_page = defaultdict(set)
+    for rx0, ry0, rx1, ry1 in regions:
+        w = min(x1, rx1) - max(x0, rx0)
+        h = min(y1, ry1) - max(y0, ry0)
+        if area <= 0:
+            if rx0 <= x0 <= rx1 and ry0 <= y0 <= ry1:
+                return True
+        elif w > 0 and h > 0 and w * h >= TABLE_OVERLAP_RATIO * area:
+            return True
 
-    for t in tables:
-        tables_by_page[t.page].append(t)
-        for row in t.df.values:
-            for cell in row:
-                if isinstance(cell, str):
-                    table_text_by_page[t.page].add(
-                        " ".join(cell.split()).lower()
-                    )
+    return False
 
-    doc = fitz.open(str(pdf_path))
-    blocks: List[Block] = []
 
-    for page_index, page in enumerate(doc):
-        page_no = page_index + 1
-        table_texts = table_text_by_page.get(page_no, set())
+def extract_pdf_blocks(pdf: Union[Path, ParsedDocument]) -> List[Block]:
+    """
+    Accepts a path or an already-open ParsedDocument
+    (pass the latter to share one parse between consumers).
+    """
+    if not isinstance(pdf, ParsedDocument):
+        with ParsedDocument(pdf) as parsed:
+            return list(iter_pdf_blocks(parsed))
+
+    return list(iter_pdf_blocks(pdf))
+
+
+def iter_pdf_blocks(parsed: ParsedDocument) -> Iterator[Block]:
+    """
+    Yields blocks page by page, in (page_number, y) order.
+    Only the current page's blocks and Camelot tables are held in memory.
+    """
+    info = parsed.info
+
+    for page_no in range(1, parsed.page_count + 1):
+        blocks: List[Block] = []
+        tables = parsed.page_tables(page_no)
+        regions = parsed.table_regions(page_no, tables)
 
         # Paragraph blocks
-        for block in page.get_text("blocks"):
+        for block in parsed.text_blocks(page_no):
             x0, y0, x1, y1, text, *_ = block
             if not text.strip():
                 continue
 
-            cleaned = " ".join(text.split()).lower()
-            if any(t in cleaned for t in table_texts):
+            # Text that Camelot already captured as a table
+            if regions and inside_table(x0, y0, x1, y1, regions):
                 continue
 
-            blocks.append(Block(
-                type="paragraph",
-                content=text.strip(),
-                page_number=page_no,
-                y=y0,
-                plan_name=plan_name,
-                product_name=product_name,
-                file_name=file_name,
-                source=source
-            ))
+            blocks.append(Block("paragraph", text.strip(), page_no, y0, info))
 
         # Table blocks
-        for t in tables_by_page.get(page_no, []):
-            blocks.append(Block(
-                type="table",
-                content=t.df.to_html(index=False),
-                page_number=page_no,
-                y=9999.0,
-                plan_name=plan_name,
-                product_name=product_name,
-                file_name=file_name,
-                source=source
-            ))
-
-    doc.close()
-    return sorted(blocks, key=lambda b: (b.page_number, b.y))
+        for t in tables:
+            blocks.append(Block("table", t.df.to_html(index=False), page_no, 9999.0, info))
+
+        blocks.sort(key=lambda b: b.y)
+        yield from blocks
@@ -0,0 +1,117 @@
+"""
+Blue/green re-index: builds a new collection version while the live one
+keeps serving, validates it with the evaluation suite and swaps the alias.
+
+    python -m src.ingestion.reindex <documents folder> --evaluation-dataset evaluation/evaluation_dataset.xlsx
+"""
+import argparse
+from typing import Optional
+
+import pandas as pd
+
+from src.ingestion.ingest_service import ingest_folder
+from src.vectorstore.collection_versions import (
+    create_version,
+    gc_versions,
+    swap_alias,
+    versions_config
+)
+from src.vectorstore.pgvector_store import use_collection
+from src.utils.logger import get_logger
+
+from run_evaluation import run_evaluation
+
+logger = get_logger("REINDEX", "ingestion.log")
+
+
+def reindex(
+    base_path: str,
+    evaluation_dataset_path: Optional[str] = None,
+    min_overall_score: Optional[float] = None,
+    swap: bool = True,
+    collection_name: Optional[str] = None,
+    checkpoint=None
+) -> dict:
+    """
+    1. ingests base_path into a new, empty "<alias>__v<n>" collection (or
+       keeps building `collection_name`, e.g. when a job resumes)
+    2. optionally runs the evaluation dataset against that version only
+    3. if no file failed and its mean overall_score over all questions
+       (unscored ones count as 0) reaches min_overall_score
+       (vectorstore.versions.min_overall_score), swaps the alias to it and
+       garbage-collects older versions
+
+    `checkpoint` is passed on to ingest_folder (see job_queue). A rejected
+    version is left in place for inspection; a manual gc removes it.
+    Returns a report of the build, the score and what went live; `rejected`
+    says why a version was not swapped in.
+    """
+    if min_overall_score is None:
+        min_overall_score = versions_config["min_overall_score"]
+
+    collection_name = collection_name or create_version()
+    logger.info(f"Building {collection_name} from {base_path}")
+
+    # The new collection starts empty, so incremental mode loads every file
+    # and keeps the per-row index maintenance: the shared indexes also serve
+    # the live version and must not be dropped (deferred_indexes) meanwhile
+    stats = ingest_folder(
+        base_path,
+        incremental=True,
+        collection_name=collection_name,
+        checkpoint=checkpoint
+    )
+
+    report = {"collection_name": collection_name, **stats, "swapped": False}
+
+    if stats["failed"]:
+        report["rejected"] = f"{stats['failed']} file(s) failed"
+        logger.warning(f"{collection_name}: {report['rejected']}; alias not swapped")
+        return report
+
+    if evaluation_dataset_path:
+        with use_collection(collection_name):
+            results = run_evaluation(evaluation_dataset_path)
+
+        # Rows run_evaluation could not score count as 0, so a version that
+        # errors on part of the dataset cannot pass on the rest
+        questions = len(pd.read_excel(evaluation_dataset_path))
+        scored = float(results["overall_score"].sum()) if len(results) else 0.0
+        score = scored / questions if questions else 0.0
+
+        report["overall_score"] = round(score, 2)
+        report["evaluated"] = f"{len(results)}/{questions}"
+
+        if score < min_overall_score:
+            report["rejected"] = f"overall_score {score:.2f} < {min_overall_score}"
+            logger.warning(f"{collection_name}: {report['rejected']}; alias not swapped")
+            return report
+
+    if swap:
+        report["previous"] = swap_alias(collection_name)
+        report["swapped"] = True
+        # Older versions only: a newer one may be another build in progress
+        report["deleted"] = gc_versions(include_newer=False)
+
+    logger.info(f"Re-index finished: {report}")
+    return report
+
+
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("base_path")
+    parser.add_argument("--evaluation-dataset")
+    parser.add_argument("--min-overall-score", type=float)
+    parser.add_argument("--no-swap", action="store_true")
+    args = parser.parse_args()
+
+    print(reindex(
+        args.base_path,
+        args.evaluation_dataset,
+        args.min_overall_score,
+        swap=not args.no_swap
+    ))
@@ -0,0 +1,53 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Iterator, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class LocalFakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for the chat model (load tests, benchmarks).
+    Returns a canned answer after a simulated time-to-first-token and a
+    per-token delay; sync calls block a thread, async calls only sleep
+    on the event loop, like the real client.
+    """
+
+    response: str = (
+        "Answer:\n- According to the policy documents, this is a simulated answer.\n\n"
+        "Sources:\n- Document Name: simulated.pdf\n- Page Number(s): 1"
+    )
+    first_token_latency: float = 0.5
+    token_latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "local-fake-chat"
+
+    def _tokens(self) -> List[str]:
+        return [t + " " for t in self.response.split(" ")]
+
+    def _total_latency(self) -> float:
+        return self.first_token_latency + self.token_latency * len(self._tokens())
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._total_latency())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._total_latency())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.first_token_latency)
+        for token in self._tokens():
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.first_token_latency)
+        for token in self._tokens():
+            await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
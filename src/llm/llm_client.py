@@ -4,16 +4,23 @@ import os
 load_dotenv()  # 🔥 THIS IS THE FIX
 
 from langchain_openai import ChatOpenAI
+from src.llm.fake_llm import LocalFakeChatModel
 from src.utils.config_loader import load_config
 
 config = load_config()
 
-if not os.getenv("OPENAI_API_KEY"):
-    raise EnvironmentError(
-        "OPENAI_API_KEY is not set. Check your .env or environment variables."
+if config["llm"].get("provider", "openai") == "fake":
+    # Offline load tests: no API key, simulated latency
+    llm = LocalFakeChatModel(
+        first_token_latency=config["llm"].get("fake_latency_seconds", 0.5)
     )
+else:
+    if not os.getenv("OPENAI_API_KEY"):
+        raise EnvironmentError(
+            "OPENAI_API_KEY is not set. Check your .env or environment variables."
+        )
 
-llm = ChatOpenAI(
-    model=config["llm"]["model"],
-    temperature=config["llm"]["temperature"]
-)
+    llm = ChatOpenAI(
+        model=config["llm"]["model"],
+        temperature=config["llm"]["temperature"]
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal
+from typing import List, Literal, Optional, Union
 from uuid import UUID
 from datetime import datetime
 
@@ -14,3 +14,32 @@ class ChunkMetadata(BaseModel):
     source: str
     checksum: str
     ingested_at: datetime
+
+
+ChunkType = Literal["text", "table"]
+
+
+class RetrievalFilters(BaseModel):
+    """
+    Optional retrieval scope. Each field takes one value or a list;
+    fields are ANDed, values within a field are ORed.
+    """
+    plan_name: Optional[Union[str, List[str]]] = None
+    product_name: Optional[Union[str, List[str]]] = None
+    file_name: Optional[Union[str, List[str]]] = None
+    type: Optional[Union[ChunkType, List[ChunkType]]] = None
+
+    def to_vectorstore_filter(self) -> Optional[dict]:
+        """
+        PGVector filter dict, or None when nothing is set.
+        Always `$in` - it compiles to `cmetadata->>'field' IN (...)`,
+        which the metadata expression indexes can serve.
+        """
+        clauses = {}
+
+        for field, value in self.model_dump(exclude_none=True).items():
+            values = [value] if isinstance(value, str) else value
+            if values:
+                clauses[field] = {"$in": values}
+
+        return clauses or None
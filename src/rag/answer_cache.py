@@ -0,0 +1,167 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_question(question: str) -> str:
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.rstrip(" ?.!")
+
+
+class AnswerCache:
+    """
+    Two-level cache in front of answer_query.
+
+    - exact tier: keyed by the normalized question text
+    - semantic tier: cosine similarity between the query embedding and the
+      embeddings of cached questions (small in-memory matrix)
+
+    Entries expire after `ttl_seconds` and the least recently used entry is
+    evicted beyond `max_entries`. Everything is dropped when the collection's
+    checksum fingerprint changes (i.e. after an ingestion touched a file);
+    the fingerprint is re-read at most every `fingerprint_refresh_seconds`.
+    """
+
+    def __init__(
+        self,
+        fingerprint_fn: Callable[[], str],
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.97,
+        fingerprint_refresh_seconds: float = 60
+    ):
+        self.fingerprint_fn = fingerprint_fn
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.fingerprint_refresh_seconds = fingerprint_refresh_seconds
+
+        # normalized question -> (created_at, unit query vector or None, result)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[np.ndarray], dict]]" = OrderedDict()
+        self._matrix = None
+        self._matrix_keys: List[str] = []
+        self._lock = threading.Lock()
+
+        self._fingerprint = None
+        self._fingerprint_checked_at = 0.0
+
+        self.hits = {"exact": 0, "semantic": 0}
+        self.misses = 0
+
+    # -------------------------------
+    # Fingerprint (call without the lock)
+    # -------------------------------
+    def _refresh_fingerprint(self):
+        # The read is a database round trip: only one caller makes it per
+        # refresh interval, and other lookups are not held up meanwhile
+        now = time.monotonic()
+        with self._lock:
+            if now - self._fingerprint_checked_at < self.fingerprint_refresh_seconds:
+                return
+            self._fingerprint_checked_at = now
+
+        fingerprint = self.fingerprint_fn()
+
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._entries.clear()
+                self._matrix = None
+                self._fingerprint = fingerprint
+
+    # -------------------------------
+    # Housekeeping (call with lock held)
+    # -------------------------------
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [k for k, (created, _, _) in self._entries.items() if created < cutoff]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def _semantic_index(self):
+        if self._matrix is None:
+            self._matrix_keys = [k for k, (_, vec, _) in self._entries.items() if vec is not None]
+            self._matrix = (
+                np.stack([self._entries[k][1] for k in self._matrix_keys])
+                if self._matrix_keys else None
+            )
+        return self._matrix
+
+    # -------------------------------
+    # Lookups
+    # -------------------------------
+    def get_exact(self, question: str) -> Optional[dict]:
+        key = normalize_question(question)
+        self._refresh_fingerprint()
+
+        with self._lock:
+            self._expire()
+
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits["exact"] += 1
+            return entry[2]
+
+    def get_semantic(self, query_vector: List[float]) -> Optional[dict]:
+        vec = np.asarray(query_vector, dtype=np.float32)
+        vec /= np.linalg.norm(vec) or 1.0
+
+        with self._lock:
+            matrix = self._semantic_index()
+            if matrix is None:
+                self.misses += 1
+                return None
+
+            scores = matrix @ vec
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            key = self._matrix_keys[best]
+            self._entries.move_to_end(key)
+            self.hits["semantic"] += 1
+            return self._entries[key][2]
+
+    # -------------------------------
+    # Store
+    # -------------------------------
+    def put(self, question: str, query_vector: Optional[List[float]], result: dict):
+        key = normalize_question(question)
+
+        vec = None
+        if query_vector is not None:
+            vec = np.asarray(query_vector, dtype=np.float32)
+            vec /= np.linalg.norm(vec) or 1.0
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vec, result)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            self._matrix = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def stats(self) -> dict:
+        total = self.hits["exact"] + self.hits["semantic"] + self.misses
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.hits["exact"],
+            "semantic_hits": self.hits["semantic"],
+            "misses": self.misses,
+            "hit_rate": round((total - self.misses) / total, 4) if total else 0.0
+        }
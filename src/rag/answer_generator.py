@@ -1,67 +1,148 @@
-from src.retrieval.retriever import retrieve_relevant_chunks
+from src.retrieval.retriever import aretrieve_relevant_chunks, retrieve_relevant_chunks
+from src.retrieval.context_planner import FETCH_K, aplan_context, plan_context
 from src.prompts.system_prompt import prompt_template
 from src.llm.llm_client import llm
+from src.rag.answer_cache import AnswerCache
+from src.rag.context_packer import pack_context
+from src.rag.extractive import extractive_answer, extractive_config
+from src.vectorstore.pgvector_store import (
+    aquery_embeddings,
+    collection_override,
+    get_checksum_fingerprint,
+    query_embeddings
+)
+from src.utils.config_loader import load_config
 from src.utils.logger import get_logger
+import asyncio
 import traceback
+from typing import AsyncIterator, List, Optional, Tuple
 
 logger = get_logger("ANSWER_GENERATOR", "answer.log")
 
+config = load_config()
 
-def answer_query(query: str):
+cache_config = config["answer_cache"]
+
+batch_config = config["batch_query"]
+
+answer_cache = AnswerCache(
+    fingerprint_fn=get_checksum_fingerprint,
+    max_entries=cache_config["max_entries"],
+    ttl_seconds=cache_config["ttl_seconds"],
+    similarity_threshold=cache_config["similarity_threshold"],
+    fingerprint_refresh_seconds=cache_config["fingerprint_refresh_seconds"]
+) if cache_config["enabled"] else None
+
+NO_INFO_ANSWER = "I'm sorry, I do not have information regarding this."
+
+INTERNAL_ERROR_ANSWER = "An internal error occurred while processing your request. Please try again later."
+
+
+def build_context(chunks):
+    """
+    Returns (context, sources, retrieval_details, context_tokens) for the
+    retrieved chunks. The context is packed to the token budget, so
+    sources/details only list the chunks that made it in.
+    """
+    context, used, context_tokens = pack_context(chunks)
+
+    sources = []
+    retrieval_details = []
+
+    for idx in used:
+        doc, semantic_score = chunks[idx]
+
+        # Explainability (user-facing)
+        sources.append({
+            "document_name": doc.metadata.get("file_name"),
+            "page_number": doc.metadata.get("page_number"),
+            "source": doc.metadata.get("source")
+        })
+
+        # Evaluation & debugging (internal)
+        retrieval_details.append({
+            "rank": idx + 1,
+            "document_name": doc.metadata.get("file_name"),
+            "page_number": doc.metadata.get("page_number"),
+            "semantic_score": round(semantic_score, 2)
+        })
+
+    return context, sources, retrieval_details, context_tokens
+
+
+def _cache_for(filters):
+    # Cached answers are unscoped and come from the live collection; a
+    # filtered question or one pinned to another version must not reuse them
+    return None if filters or collection_override() else answer_cache
+
+
+def _extractive(query, chunks, extractive):
+    """
+    Extractive fast path result, or None to go through the LLM.
+    `extractive` (per request) overrides extractive.enabled.
+    """
+    enabled = extractive_config["enabled"] if extractive is None else extractive
+    return extractive_answer(query, chunks) if enabled else None
+
+
+def _log_failure():
+    # Critical error logging
+    logger.error("Error occurred during answer generation")
+    logger.error(traceback.format_exc())
+
+
+def answer_query(query: str, filters: Optional[dict] = None, extractive: Optional[bool] = None):
     """
     Enterprise-grade RAG pipeline with robust error handling
+    `filters` is a vector store metadata filter (see RetrievalFilters).
+    `extractive` allows answering high-confidence lookups without the LLM;
+    the result's "path" says which way it went (llm, extractive, none).
     """
 
     # logger.info(f"Received query: {query}")
 
     try:
-        # 1️⃣ Retrieve relevant chunks
-        chunks = retrieve_relevant_chunks(query)
+        # 0️⃣ Answer cache: exact question, then semantically similar question
+        query_embedding = None
+        cache = _cache_for(filters)
+
+        if cache:
+            cached = cache.get_exact(query)
+            if cached:
+                return {**cached, "cache": "exact"}
+
+            query_embedding = query_embeddings().embed_query(query)
+            cached = cache.get_semantic(query_embedding)
+            if cached:
+                return {**cached, "cache": "semantic"}
+
+        # 1️⃣ Retrieve candidates
+        candidates = retrieve_relevant_chunks(
+            query,
+            k=FETCH_K,
+            query_embedding=query_embedding,
+            filters=filters
+        )
+
+        # Extractive fast path (not cached: it is cheap and request-specific)
+        fast = _extractive(query, candidates, extractive)
+        if fast:
+            return {**fast, "cache": "miss"}
+
+        # Dedupe + MMR down to the prompt budget
+        chunks = plan_context(candidates)
         # logger.info(f"Retrieved {len(chunks)} relevant chunks")
 
         # 2️⃣ No relevant info
         if not chunks:
             # logger.warning("No relevant chunks found above similarity threshold")
-            return {
-                "answer": "I'm sorry, I do not have information regarding this."
-            }
+            result = {"answer": NO_INFO_ANSWER, "path": "none"}
+            if cache:
+                cache.put(query, query_embedding, result)
+            return {**result, "cache": "miss"}
 
         # 3️⃣ Build context
-        context_blocks = []
-        sources = []
-        retrieval_details = []
-
-        for idx, (doc, semantic_score) in enumerate(chunks, start=1):
-
-            context_blocks.append(
-                f"""
-                --- Document {idx} ---
-                Source: {doc.metadata.get("source")}
-                Document Name: {doc.metadata.get("file_name")}
-                Page Number: {doc.metadata.get("page_number")}
-                Semantic Score: {round(semantic_score, 2)}
-
-                Content:
-                {doc.page_content}
-                """.strip()
-            )
-
-            # Explainability (user-facing)
-            sources.append({
-                "document_name": doc.metadata.get("file_name"),
-                "page_number": doc.metadata.get("page_number"),
-                "source": doc.metadata.get("source")
-            })
-
-            # Evaluation & debugging (internal)
-            retrieval_details.append({
-                "rank": idx,
-                "document_name": doc.metadata.get("file_name"),
-                "page_number": doc.metadata.get("page_number"),
-                "semantic_score": round(semantic_score, 2)
-            })
-
-        context = "\n\n".join(context_blocks)
+        context, sources, _, context_tokens = build_context(chunks)
 
         # 4️⃣ Prompt construction
         messages = prompt_template.format_messages(
@@ -69,24 +150,235 @@ def answer_query(query: str):
             question=query
         )
 
-        # logger.info("Invoking LLM")
-
         # 5️⃣ LLM invocation
         response = llm.invoke(messages)
 
-        # logger.info("LLM response generated successfully")
+        result = {
+            "answer": response.content,
+            "retrieval_context": context,
+            "sources": sources,
+            "context_tokens": context_tokens,
+            "path": "llm"
+        }
 
-        # return response.content
+        if cache:
+            cache.put(query, query_embedding, result)
 
-        return {
-            "answer": response.content,
-            "retrieval_context": context
+        return {**result, "cache": "miss"}
+
+    except Exception:
+        _log_failure()
+        return {"answer": INTERNAL_ERROR_ANSWER}
+
+
+async def _aanswer(
+    query: str,
+    query_embedding=None,
+    filters=None,
+    extractive=None
+):
+    """
+    Core of aanswer_query. Raises on failure so callers decide how to
+    report it. A precomputed query_embedding skips the embedding call.
+    """
+    cache = _cache_for(filters)
+
+    if cache:
+        # May re-read the collection fingerprint (sync DB call) - keep it off the loop
+        cached = await asyncio.to_thread(cache.get_exact, query)
+        if cached:
+            return {**cached, "cache": "exact"}
+
+        if query_embedding is None:
+            query_embedding = await (await aquery_embeddings()).aembed_query(query)
+        cached = cache.get_semantic(query_embedding)
+        if cached:
+            return {**cached, "cache": "semantic"}
+
+    candidates = await aretrieve_relevant_chunks(
+        query,
+        k=FETCH_K,
+        query_embedding=query_embedding,
+        filters=filters
+    )
+
+    fast = _extractive(query, candidates, extractive)
+    if fast:
+        return {**fast, "cache": "miss"}
+
+    chunks = await aplan_context(candidates)
+
+    if not chunks:
+        result = {"answer": NO_INFO_ANSWER, "path": "none"}
+        if cache:
+            cache.put(query, query_embedding, result)
+        return {**result, "cache": "miss"}
+
+    context, sources, _, context_tokens = build_context(chunks)
+
+    messages = prompt_template.format_messages(
+        context=context,
+        question=query
+    )
+
+    response = await llm.ainvoke(messages)
+
+    result = {
+        "answer": response.content,
+        "retrieval_context": context,
+        "sources": sources,
+        "context_tokens": context_tokens,
+        "path": "llm"
+    }
+
+    if cache:
+        cache.put(query, query_embedding, result)
+
+    return {**result, "cache": "miss"}
+
+
+async def aanswer_query(
+    query: str,
+    filters: Optional[dict] = None,
+    extractive: Optional[bool] = None
+):
+    """
+    Async twin of answer_query: async embedding, async pgvector search
+    and llm.ainvoke, so a request never holds a worker thread while it
+    waits on the database or the LLM.
+    """
+    try:
+        return await _aanswer(query, filters=filters, extractive=extractive)
+
+    except Exception:
+        _log_failure()
+        return {"answer": INTERNAL_ERROR_ANSWER}
+
+
+async def abatch_answer_queries(
+    questions: List[str],
+    max_concurrency: int = None,
+    filters: Optional[dict] = None,
+    extractive: Optional[bool] = None
+) -> List[dict]:
+    """
+    Answers many questions at once. All questions are embedded in a single
+    embedding call, then at most max_concurrency questions are answered
+    concurrently (retrieval and LLM call), so a large batch neither drains
+    the async connection pool nor floods the LLM.
+    Results keep the input order; a failed item carries an "error" instead
+    of failing the whole batch.
+    """
+    if not questions:
+        return []
+
+    max_concurrency = max_concurrency or batch_config["max_concurrency"]
+    limiter = asyncio.Semaphore(max_concurrency)
+
+    # One round-trip for the whole batch (cache hits never leave the process)
+    embedder = await aquery_embeddings()
+    vectors = await embedder.aembed_documents(questions)
+
+    async def answer_one(question, query_embedding):
+        try:
+            async with limiter:
+                return await _aanswer(question, query_embedding, filters, extractive)
+        except Exception:
+            _log_failure()
+            return {"answer": None, "error": INTERNAL_ERROR_ANSWER}
+
+    return await asyncio.gather(*(
+        answer_one(question, query_embedding)
+        for question, query_embedding in zip(questions, vectors)
+    ))
+
+
+async def astream_answer(
+    query: str,
+    filters: Optional[dict] = None,
+    extractive: Optional[bool] = None
+) -> AsyncIterator[Tuple[str, object]]:
+    """
+    Streaming variant of aanswer_query. Yields (event, data) pairs:
+    "retrieval" first (ranked chunk metadata), then "token" for every LLM
+    delta, then "sources", then "done" (with the answer path).
+    Failures yield a single "error".
+    """
+    try:
+        query_embedding = None
+        cache = _cache_for(filters)
+
+        if cache:
+            tier = "exact"
+            cached = await asyncio.to_thread(cache.get_exact, query)
+            if not cached:
+                tier = "semantic"
+                query_embedding = await (await aquery_embeddings()).aembed_query(query)
+                cached = cache.get_semantic(query_embedding)
+
+            if cached:
+                yield "retrieval", {"cache": tier, "chunks": []}
+                yield "token", cached["answer"]
+                yield "sources", cached.get("sources", [])
+                yield "done", {"path": cached.get("path")}
+                return
+
+        candidates = await aretrieve_relevant_chunks(
+            query,
+            k=FETCH_K,
+            query_embedding=query_embedding,
+            filters=filters
+        )
+
+        fast = _extractive(query, candidates, extractive)
+        if fast:
+            yield "retrieval", {"cache": "miss", "chunks": [], "context_tokens": 0}
+            yield "token", fast["answer"]
+            yield "sources", fast["sources"]
+            yield "done", {"path": "extractive"}
+            return
+
+        chunks = await aplan_context(candidates)
+        context, sources, retrieval_details, context_tokens = build_context(chunks)
+
+        yield "retrieval", {
+            "cache": "miss",
+            "chunks": retrieval_details,
+            "context_tokens": context_tokens
         }
 
-    except Exception as e:
-        # Critical error logging
-        logger.error("Error occurred during answer generation")
-        logger.error(str(e))
-        logger.error(traceback.format_exc())
+        if not chunks:
+            result = {"answer": NO_INFO_ANSWER, "path": "none"}
+            if cache:
+                cache.put(query, query_embedding, result)
+            yield "token", NO_INFO_ANSWER
+            yield "sources", []
+            yield "done", {"path": "none"}
+            return
+
+        messages = prompt_template.format_messages(
+            context=context,
+            question=query
+        )
+
+        parts = []
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield "token", chunk.content
+
+        if cache:
+            cache.put(query, query_embedding, {
+                "answer": "".join(parts),
+                "retrieval_context": context,
+                "sources": sources,
+                "context_tokens": context_tokens,
+                "path": "llm"
+            })
+
+        yield "sources", sources
+        yield "done", {"path": "llm"}
 
-        return "An internal error occurred while processing your request. Please try again later.",
\ No newline at end of file
+    except Exception:
+        _log_failure()
+        yield "error", {"answer": INTERNAL_ERROR_ANSWER}
@@ -0,0 +1,128 @@
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+import tiktoken
+
+from src.utils.config_loader import load_config
+
+config = load_config()
+
+packer_config = config["context"]
+
+
+# ===============================
+# TOKENIZER
+# ===============================
+# The prompt is measured with the chat model's own encoding
+llm_enc = tiktoken.encoding_for_model(config["llm"]["model"])
+
+
+# Labels, document headers and table rows recur across requests and are
+# memoised; whole chunks would only pin their text in the cache
+CACHED_TEXT_CHARS = 256
+
+
+@lru_cache(maxsize=4096)
+def _count_short_tokens(text: str) -> int:
+    return len(llm_enc.encode(text))
+
+
+def count_tokens(text: str) -> int:
+    if len(text) <= CACHED_TEXT_CHARS:
+        return _count_short_tokens(text)
+    return len(llm_enc.encode(text))
+
+
+# ===============================
+# CHUNK CLEANUP
+# ===============================
+def _compact(text: str) -> str:
+    text = re.sub(r"[ \t]{2,}", " ", text)
+    return re.sub(r"\n\s*\n+", "\n", text).strip()
+
+
+def truncate_table(table: str, max_tokens: int) -> str:
+    """
+    Keeps the header row and as many leading rows as fit in max_tokens,
+    then notes how many rows were cut. Returns "" when not even the
+    header and one row fit.
+    """
+    rows = table.split("\n")
+    header, body = rows[0], rows[1:]
+
+    kept = [header]
+    # Room for the "[... N more rows]" note
+    used = count_tokens(header) + count_tokens(f"[... {len(body)} more rows]") + 1
+
+    for row in body:
+        cost = count_tokens(row) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(row)
+        used += cost
+
+    if len(kept) < 2:
+        return ""
+
+    cut = len(rows) - len(kept)
+    if cut:
+        kept.append(f"[... {cut} more rows]")
+
+    return "\n".join(kept)
+
+
+# ===============================
+# PACKING
+# ===============================
+def pack_context(chunks, max_tokens: int = None) -> Tuple[str, List[int], int]:
+    """
+    Packs ranked (doc, score) chunks into a compact context of at most
+    max_tokens (context.token_budget by default), in rank order.
+
+    Chunks are grouped under one header per document, so file name and
+    source are not repeated for every chunk. A table that does not fit is
+    cut to its header plus leading rows; other chunks that do not fit are
+    skipped.
+
+    Returns (context, indexes of the chunks used, context token count).
+    """
+    max_tokens = max_tokens or packer_config["token_budget"]
+
+    documents = {}      # source -> [header, page sections...], first-seen order
+    used = []
+    total = 0
+
+    for idx, (doc, _) in enumerate(chunks):
+        source = doc.metadata.get("source")
+
+        header = ""
+        if source not in documents:
+            header = f"## {doc.metadata.get('file_name')} (Source: {source})"
+
+        label = f"[Page {doc.metadata.get('page_number')}]"
+        content = _compact(doc.page_content)
+
+        fixed = count_tokens(label) + (count_tokens(header) + 2 if header else 0) + 2
+        remaining = max_tokens - total - fixed
+
+        if remaining <= 0:
+            continue
+
+        tokens = count_tokens(content)
+        if tokens > remaining:
+            if doc.metadata.get("type") != "table":
+                continue
+            content = truncate_table(content, remaining)
+            if not content:
+                continue
+            tokens = count_tokens(content)
+
+        if header:
+            documents[source] = [header]
+        documents[source].append(f"{label}\n{content}")
+        used.append(idx)
+        total += fixed + tokens
+
+    context = "\n\n".join("\n".join(sections) for sections in documents.values())
+    return context, used, count_tokens(context)
@@ -0,0 +1,95 @@
+import re
+from typing import Optional
+
+from src.rag.context_packer import llm_enc
+from src.utils.config_loader import load_config
+
+config = load_config()
+
+extractive_config = config["extractive"]
+
+# Ignored when matching question words against passages
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it of on or "
+    "the this to under what when where which who why with".split()
+)
+
+
+def _terms(text: str) -> set:
+    return {t for t in re.findall(r"[^\W_]+", text.lower()) if t not in STOPWORDS}
+
+
+def _passages(doc):
+    """
+    Answer units of a chunk: table rows (each with the header row) or sentences
+    """
+    content = doc.page_content.strip()
+
+    if doc.metadata.get("type") == "table":
+        header, *rows = content.split("\n")
+        return [f"{header}\n{row}" for row in rows] or [header]
+
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", content) if s.strip()]
+
+
+def best_passage(query: str, doc, max_tokens: int) -> Optional[str]:
+    """
+    The row / sentence sharing the most (non-stopword) words with the
+    query, cut to max_tokens. None when no passage shares any word.
+    """
+    terms = _terms(query)
+    overlap, passage = max(
+        ((len(terms & _terms(p)), p) for p in _passages(doc)),
+        key=lambda item: item[0]
+    )
+
+    if not overlap:
+        return None
+
+    tokens = llm_enc.encode(passage)
+    if len(tokens) > max_tokens:
+        passage = llm_enc.decode(tokens[:max_tokens]) + " ..."
+
+    return passage
+
+
+def extractive_answer(query: str, chunks) -> Optional[dict]:
+    """
+    Answers straight from the best retrieved chunk when its similarity is
+    at least extractive.confidence_threshold: the matching passage plus
+    its citation, in the same Answer/Sources layout the LLM is asked for.
+    Returns None when the LLM should answer instead.
+    """
+    if not chunks:
+        return None
+
+    doc, score = max(chunks, key=lambda chunk: chunk[1])
+    if score < extractive_config["confidence_threshold"]:
+        return None
+
+    passage = best_passage(query, doc, extractive_config["max_passage_tokens"])
+    if passage is None:
+        return None
+
+    source = {
+        "document_name": doc.metadata.get("file_name"),
+        "page_number": doc.metadata.get("page_number"),
+        "source": doc.metadata.get("source")
+    }
+
+    answer = (
+        f"Answer:\n- According to the policy documents: {passage}\n\n"
+        f"Sources:\n"
+        f"- Document Name: {source['document_name']}\n"
+        f"- Source: {source['source']}\n"
+        f"- Page Number(s): {source['page_number']}"
+    )
+
+    return {
+        "answer": answer,
+        "retrieval_context": passage,
+        "sources": [source],
+        "context_tokens": 0,
+        "confidence": round(score, 2),
+        "path": "extractive"
+    }
@@ -0,0 +1,136 @@
+from collections import Counter
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.rag.context_packer import count_tokens, truncate_table
+from src.utils.config_loader import load_config
+from src.vectorstore.pgvector_store import aget_embeddings, get_embeddings
+
+config = load_config()
+
+planner_config = config["context"]
+
+# Candidates to retrieve: MMR needs a wider pool than the final top_k
+FETCH_K = planner_config["fetch_k"] if planner_config["enabled"] else config["retrieval"]["top_k"]
+
+
+# ===============================
+# SELECTION
+# ===============================
+def _unit_matrix(chunks, vectors: Dict[str, List[float]]) -> np.ndarray:
+    # Chunks whose vector is missing (deleted meanwhile) get a zero row:
+    # never a duplicate of anything, still selectable on rank
+    dimensions = len(next(iter(vectors.values()))) if vectors else 1
+    matrix = np.zeros((len(chunks), dimensions), dtype=np.float32)
+
+    for i, (doc, _) in enumerate(chunks):
+        if doc.id in vectors:
+            matrix[i] = vectors[doc.id]
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def mmr_select(
+    chunks,
+    vectors: Dict[str, List[float]],
+    k: int,
+    token_budget: int,
+    lambda_mult: float,
+    duplicate_similarity: float,
+    max_chunks_per_page: int,
+    length_function: Callable[[str], int] = count_tokens
+):
+    """
+    Picks up to k of the ranked (doc, score) chunks by maximal marginal
+    relevance under a token budget.
+
+    Relevance is the chunk's retrieval rank (so hybrid/RRF ordering is
+    kept), redundancy its highest cosine similarity to an already picked
+    chunk. Near-duplicates (page overlap, splitter overlap) and chunks
+    beyond max_chunks_per_page for the same (file, page) are dropped;
+    chunks that no longer fit the budget are skipped, except tables, which
+    are admitted at the cost of the header + leading rows that still fit
+    (pack_context cuts them the same way).
+    """
+    if not chunks:
+        return []
+
+    n = len(chunks)
+    matrix = _unit_matrix(chunks, vectors)
+    similarity = matrix @ matrix.T
+
+    relevance = 1 - np.arange(n, dtype=np.float32) / n
+    redundancy = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    selected = []
+    per_page = Counter()
+    used_tokens = 0
+
+    while available.any() and len(selected) < k:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        best = int(np.argmax(np.where(available, scores, -np.inf)))
+        available[best] = False
+
+        doc = chunks[best][0]
+        page = (doc.metadata.get("file_name"), doc.metadata.get("page_number"))
+
+        if per_page[page] >= max_chunks_per_page:
+            continue
+        if selected and redundancy[best] >= duplicate_similarity:
+            continue
+
+        tokens = length_function(doc.page_content)
+        if used_tokens + tokens > token_budget:
+            if doc.metadata.get("type") != "table":
+                continue
+
+            truncated = truncate_table(doc.page_content, token_budget - used_tokens)
+            if not truncated:
+                continue
+            tokens = length_function(truncated)
+
+        selected.append(best)
+        per_page[page] += 1
+        used_tokens += tokens
+        redundancy = np.maximum(redundancy, similarity[best])
+
+    return [chunks[i] for i in selected]
+
+
+def _select(chunks, vectors):
+    return mmr_select(
+        chunks,
+        vectors,
+        k=config["retrieval"]["top_k"],
+        token_budget=planner_config["token_budget"],
+        lambda_mult=planner_config["mmr_lambda"],
+        duplicate_similarity=planner_config["duplicate_similarity"],
+        max_chunks_per_page=planner_config["max_chunks_per_page"]
+    )
+
+
+# ===============================
+# ENTRY POINTS
+# ===============================
+def plan_context(chunks):
+    """
+    Post-retrieval stage: dedupe + MMR over the retrieved candidates
+    (stored vectors are fetched in one query)
+    """
+    if not chunks or not planner_config["enabled"]:
+        return chunks
+
+    return _select(chunks, get_embeddings([doc.id for doc, _ in chunks]))
+
+
+async def aplan_context(chunks):
+    """
+    Async version of plan_context
+    """
+    if not chunks or not planner_config["enabled"]:
+        return chunks
+
+    return _select(chunks, await aget_embeddings([doc.id for doc, _ in chunks]))
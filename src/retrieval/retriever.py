@@ -1,27 +1,136 @@
+import asyncio
+from collections import defaultdict
+from typing import List, Optional
 
-from src.vectorstore.pgvector_store import vector_store
+from src.utils.config_loader import load_config
+from src.vectorstore.pgvector_store import (
+    adense_search_with_score,
+    akeyword_search_with_score,
+    aquery_embeddings,
+    dense_search_with_score,
+    keyword_search_with_score,
+    query_embeddings
+)
+
+config = load_config()
+
+retrieval_config = config["retrieval"]
+hybrid_config = retrieval_config["hybrid"]
+
+
+def _filter_by_threshold(results, similarity_threshold: float):
+    filtered_chunks = []
+
+    for doc, score in results:
+        semantic_score = 1 - score  # distance → similarity
+        if semantic_score >= similarity_threshold:
+            filtered_chunks.append((doc, semantic_score))
+
+    return filtered_chunks
+
+
+def _to_similarity(results):
+    return [(doc, 1 - score) for doc, score in results]
+
+
+def reciprocal_rank_fusion(rankings, weights, k: int, rrf_k: int):
+    """
+    Fuses ranked (doc, similarity) lists: every list adds
+    weight / (rrf_k + rank) to a chunk's score. Returns the top k
+    (doc, similarity) pairs, best fused score first.
+    """
+    scores = defaultdict(float)
+    chunks = {}
+
+    for ranking, weight in zip(rankings, weights):
+        for rank, (doc, similarity) in enumerate(ranking, start=1):
+            scores[doc.id] += weight / (rrf_k + rank)
+            chunks.setdefault(doc.id, (doc, similarity))
+
+    best = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [chunks[chunk_id] for chunk_id in best]
+
+
+def _fuse(dense, keyword, k: int):
+    return reciprocal_rank_fusion(
+        [dense, keyword],
+        [hybrid_config["vector_weight"], hybrid_config["keyword_weight"]],
+        k=k,
+        rrf_k=hybrid_config["rrf_k"]
+    )
 
 
 def retrieve_relevant_chunks(
     query: str,
-    k: int = 8,
-    similarity_threshold: float = 0.40
+    k: Optional[int] = None,
+    similarity_threshold: Optional[float] = None,
+    query_embedding: Optional[List[float]] = None,
+    filters: Optional[dict] = None
 ):
     """
     Retrieve chunks and filter by semantic similarity >= threshold
+    Pass query_embedding when the caller has already embedded the query.
+    `filters` (RetrievalFilters.to_vectorstore_filter()) scopes both
+    searches inside SQL.
+
+    With retrieval.hybrid enabled, dense hits are fused (RRF) with a
+    full-text ranking, so exact tokens such as plan numbers are found
+    even when their embedding similarity is below the threshold.
     """
-    results = vector_store.similarity_search_with_score(
-        query=query,
-        k=k
+    k = k or retrieval_config["top_k"]
+    if similarity_threshold is None:
+        similarity_threshold = retrieval_config["similarity_threshold"]
+
+    if query_embedding is None:
+        query_embedding = query_embeddings().embed_query(query)
+
+    if not hybrid_config["enabled"]:
+        results = dense_search_with_score(query_embedding, k, filters)
+        return _filter_by_threshold(results, similarity_threshold)
+
+    candidates = max(k, hybrid_config["candidates"])
+
+    dense = dense_search_with_score(query_embedding, candidates, filters)
+    keyword = keyword_search_with_score(query, query_embedding, candidates, filters)
+
+    return _fuse(
+        _filter_by_threshold(dense, similarity_threshold),
+        _to_similarity(keyword),
+        k
     )
 
-    filtered_chunks = []
 
-    for doc, score in results:
-        semantic_score = 1 - score  # distance → similarity
-        if semantic_score >= similarity_threshold:
-            # print(semantic_score)
-            filtered_chunks.append((doc, semantic_score))
+async def aretrieve_relevant_chunks(
+    query: str,
+    k: Optional[int] = None,
+    similarity_threshold: Optional[float] = None,
+    query_embedding: Optional[List[float]] = None,
+    filters: Optional[dict] = None
+):
+    """
+    Async version of retrieve_relevant_chunks (async engine, no thread held)
+    """
+    k = k or retrieval_config["top_k"]
+    if similarity_threshold is None:
+        similarity_threshold = retrieval_config["similarity_threshold"]
 
-    return filtered_chunks
+    if query_embedding is None:
+        query_embedding = await (await aquery_embeddings()).aembed_query(query)
 
+    if not hybrid_config["enabled"]:
+        results = await adense_search_with_score(query_embedding, k, filters)
+        return _filter_by_threshold(results, similarity_threshold)
+
+    candidates = max(k, hybrid_config["candidates"])
+
+    # Both rankers run at once, each on its own pooled connection
+    dense, keyword = await asyncio.gather(
+        adense_search_with_score(query_embedding, candidates, filters),
+        akeyword_search_with_score(query, query_embedding, candidates, filters)
+    )
+
+    return _fuse(
+        _filter_by_threshold(dense, similarity_threshold),
+        _to_similarity(keyword),
+        k
+    )
@@ -0,0 +1,202 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.vectorstore.pgvector_store import (
+    collection_aliases,
+    collection_revisions,
+    configured_embedding,
+    embedding_column_dimensions,
+    embedding_record,
+    vector_store
+)
+from src.utils.config_loader import load_config
+from src.utils.logger import get_logger
+
+logger = get_logger("COLLECTION_VERSIONS", "ingestion.log")
+
+config = load_config()
+
+versions_config = config["vectorstore"]["versions"]
+
+# The logical name queries use; versions are "<alias>__v<n>"
+ALIAS = config["vectorstore"]["collection_name"]
+
+_VERSION_NAME = re.compile(rf"^{re.escape(ALIAS)}__v(\d+)$")
+
+
+def version_number(collection_name: str) -> Optional[int]:
+    """
+    n of "<alias>__v<n>"; 0 for the unversioned collection named like the
+    alias, None for unrelated collections
+    """
+    if collection_name == ALIAS:
+        return 0
+
+    match = _VERSION_NAME.match(collection_name)
+    return int(match.group(1)) if match else None
+
+
+# ===============================
+# LOOKUP
+# ===============================
+def live_collection() -> str:
+    """
+    Physical collection the alias currently resolves to
+    """
+    with vector_store._make_sync_session() as session:
+        target = session.execute(
+            select(collection_aliases.c.collection_name)
+            .where(collection_aliases.c.alias == ALIAS)
+        ).scalar()
+
+    return target or ALIAS
+
+
+def list_versions() -> List[dict]:
+    """
+    Every version of the alias with its chunk count and embedding model,
+    oldest first
+    """
+    collections = vector_store.CollectionStore
+    store = vector_store.EmbeddingStore
+    live = live_collection()
+
+    with vector_store._make_sync_session() as session:
+        rows = session.execute(
+            select(collections, func.count(store.id))
+            .outerjoin(store, store.collection_id == collections.uuid)
+            .group_by(collections.uuid)
+        ).all()
+
+        versions = [
+            {
+                "collection_name": collection.name,
+                "version": version_number(collection.name),
+                "chunks": chunks,
+                "live": collection.name == live,
+                **embedding_record(collection)
+            }
+            for collection, chunks in rows
+            if version_number(collection.name) is not None
+        ]
+
+    return sorted(versions, key=lambda v: v["version"])
+
+
+# ===============================
+# LIFECYCLE
+# ===============================
+def _check_dimensions(dimensions: int):
+    # All versions share the one vector(n) column and its ANN index
+    column = embedding_column_dimensions()
+    if column is not None and column > 0 and column != dimensions:
+        raise ValueError(
+            f"Embedding dimension {dimensions} does not fit the shared vector({column}) "
+            f"column; a model with another dimension needs a table migration, "
+            f"not a blue/green re-index"
+        )
+
+
+def create_version() -> str:
+    """
+    Creates the next, empty "<alias>__v<n>" collection and returns its name.
+    The configured embedding model is recorded on it; searches against the
+    version embed queries with that model (see query_embeddings), so the
+    embedding model can change through a re-index and swap.
+    """
+    record = configured_embedding()
+    _check_dimensions(record["embedding_dimensions"])
+
+    latest = max((v["version"] for v in list_versions()), default=0)
+    name = f"{ALIAS}__v{latest + 1}"
+
+    with vector_store._make_sync_session() as session:
+        vector_store.CollectionStore.get_or_create(session, name, cmetadata=record)
+
+    logger.info(f"Created collection version {name}")
+    return name
+
+
+def swap_alias(collection_name: str) -> str:
+    """
+    Points the alias at collection_name in one statement, so every
+    following search sees either the old or the new version, never a mix.
+    Also used to roll back. Returns the previously live collection.
+    """
+    if version_number(collection_name) is None:
+        raise ValueError(f"{collection_name} is not a version of {ALIAS}")
+
+    with vector_store._make_sync_session() as session:
+        collection = vector_store.CollectionStore.get_by_name(session, collection_name)
+        if not collection:
+            raise ValueError(f"Collection not found: {collection_name}")
+
+        _check_dimensions(embedding_record(collection)["embedding_dimensions"])
+
+        previous = session.execute(
+            select(collection_aliases.c.collection_name)
+            .where(collection_aliases.c.alias == ALIAS)
+        ).scalar() or ALIAS
+
+        statement = insert(collection_aliases).values(
+            alias=ALIAS, collection_name=collection_name
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[collection_aliases.c.alias],
+            set_={"collection_name": collection_name, "swapped_at": func.now()}
+        ))
+        session.commit()
+
+    logger.info(f"Alias {ALIAS}: {previous} -> {collection_name}")
+    return previous
+
+
+def gc_versions(keep_previous: Optional[int] = None, include_newer: bool = True) -> List[str]:
+    """
+    Deletes every version except the live one and the keep_previous
+    (vectorstore.versions.keep_previous) newest versions older than it,
+    which stay available for a rollback. With include_newer, versions newer
+    than the live one - abandoned or rejected builds - are deleted too;
+    never do that while a build is in progress. Returns the deleted
+    collection names.
+    """
+    if keep_previous is None:
+        keep_previous = versions_config["keep_previous"]
+
+    versions = list_versions()
+    live = next((v["version"] for v in versions if v["live"]), None)
+    if live is None:
+        # Fresh install, or the alias target was dropped: nothing is known
+        # to be safe to delete
+        logger.warning(f"Alias {ALIAS} resolves to no existing version; nothing deleted")
+        return []
+
+    older = [v["collection_name"] for v in versions if v["version"] < live]
+    kept = set(older[-keep_previous:]) if keep_previous else set()
+
+    doomed = [
+        v["collection_name"]
+        for v in versions
+        if not v["live"]
+        and v["collection_name"] not in kept
+        and (include_newer or v["version"] < live)
+    ]
+
+    with vector_store._make_sync_session() as session:
+        for name in doomed:
+            collection = vector_store.CollectionStore.get_by_name(session, name)
+            session.execute(
+                delete(collection_revisions)
+                .where(collection_revisions.c.collection_id == collection.uuid)
+            )
+            # Chunks go with it (ON DELETE CASCADE)
+            session.delete(collection)
+        session.commit()
+
+    for name in doomed:
+        logger.info(f"Deleted collection version {name}")
+
+    return doomed
@@ -0,0 +1,130 @@
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.utils.config_loader import load_config
+import os
+
+config = load_config()
+
+pool_config = config["vectorstore"]["pool"]
+
+CONNECTION_STRING = os.getenv("PGVECTOR_URL")
+
+# psycopg 3 serves both sync and async, so the async engine only needs
+# a different driver name in the URL
+ASYNC_CONNECTION_STRING = make_url(CONNECTION_STRING).set(
+    drivername="postgresql+psycopg"
+).render_as_string(hide_password=False)
+
+
+# ===============================
+# METRICS
+# ===============================
+class PoolMetrics:
+    """
+    Checkout wait times of one pool (time spent queueing for a connection)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += not timed_out
+            self.timeouts += timed_out
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self, pool) -> dict:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(1000 * self.wait_seconds / max(self.checkouts, 1), 3),
+            "max_wait_ms": round(1000 * self.max_wait_seconds, 3)
+        }
+
+
+def _metered(pool_class):
+    """
+    Pool subclass that times every checkout from the underlying queue
+    """
+
+    class MeteredPool(pool_class):
+        metrics = None
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except Exception:
+                self.metrics.record(time.perf_counter() - start, timed_out=True)
+                raise
+            self.metrics.record(time.perf_counter() - start)
+            return connection
+
+    MeteredPool.__name__ = f"Metered{pool_class.__name__}"
+    return MeteredPool
+
+
+# ===============================
+# ENGINES
+# ===============================
+def _engine_options(pool_class, statement_timeout_ms: int = 0) -> dict:
+    options = {
+        "poolclass": pool_class,
+        "pool_size": pool_config["size"],
+        "max_overflow": pool_config["max_overflow"],
+        "pool_timeout": pool_config["timeout_seconds"],
+        "pool_recycle": pool_config["recycle_seconds"],
+        "pool_pre_ping": pool_config["pre_ping"]
+    }
+
+    if statement_timeout_ms:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={int(statement_timeout_ms)}"
+        }
+
+    return options
+
+
+sync_metrics = PoolMetrics()
+async_metrics = PoolMetrics()
+
+_SyncPool = _metered(QueuePool)
+_SyncPool.metrics = sync_metrics
+
+_AsyncPool = _metered(AsyncAdaptedQueuePool)
+_AsyncPool.metrics = async_metrics
+
+# One pool per process for each flavour: every sync user (ingestion,
+# bookkeeping, evaluation) shares `engine`, every async user (the API
+# query path) shares `async_engine`. A pool cannot serve both a blocking
+# and an asyncio driver, so there are exactly two.
+# The statement timeout only guards the query path: the sync engine also
+# builds the ANN / GIN indexes, which legitimately run for minutes.
+engine = create_engine(CONNECTION_STRING, **_engine_options(_SyncPool))
+
+async_engine = create_async_engine(
+    ASYNC_CONNECTION_STRING,
+    **_engine_options(_AsyncPool, pool_config["statement_timeout_ms"])
+)
+
+
+def pool_stats() -> dict:
+    return {
+        "sync": sync_metrics.stats(engine.pool),
+        "async": async_metrics.stats(async_engine.sync_engine.pool)
+    }
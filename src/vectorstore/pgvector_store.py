@@ -1,15 +1,1048 @@
+import contextlib
+import re
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
 from langchain_postgres import PGVector
-from src.embeddings.embedder import embeddings
+from langchain_postgres.vectorstores import _get_embedding_collection_store
+from pgvector.psycopg.vector import register_vector_info
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+from psycopg.types import TypeInfo
+from psycopg.types.json import Jsonb
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    cast,
+    delete,
+    event,
+    func,
+    literal,
+    literal_column,
+    select,
+    text
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID, insert
+
+from src.embeddings.embedder import (
+    EMBEDDING_MODEL,
+    EMBEDDING_PROVIDER,
+    embeddings,
+    embeddings_for
+)
+from src.models.metadata import ChunkMetadata
+from src.vectorstore.connection_pool import async_engine, engine
 from src.utils.config_loader import load_config
-import os
+from src.utils.logger import get_logger
+
+logger = get_logger("PGVECTOR_STORE", "ingestion.log")
 
 config = load_config()
 
-CONNECTION_STRING = os.getenv("PGVECTOR_URL")
+index_config = config["vectorstore"]["index"]
+
+EMBEDDING_DIMENSIONS = config["embedding"]["dimensions"]
+
+
+# ===============================
+# COLLECTION ALIAS
+# ===============================
+# vectorstore.collection_name is a logical alias: it resolves to the
+# physical collection recorded here, or to the collection of the same name
+# when there is no row (unversioned setups). See collection_versions.
+collection_aliases = Table(
+    "langchain_pg_collection_alias",
+    MetaData(),
+    Column("alias", String, primary_key=True),
+    Column("collection_name", String, nullable=False),
+    Column("swapped_at", DateTime(timezone=True), nullable=False, server_default=func.now())
+)
+
+# Pins the stores to one physical collection; see use_collection
+_collection_override: ContextVar[Optional[str]] = ContextVar(
+    "collection_override", default=None
+)
+
+
+@contextlib.contextmanager
+def use_collection(collection_name: str):
+    """
+    Points every store lookup issued inside the block (sync or async) at
+    `collection_name` instead of the alias target, e.g. to evaluate a new
+    version before it is swapped in.
+    """
+    token = _collection_override.set(collection_name)
+    try:
+        yield
+    finally:
+        _collection_override.reset(token)
+
 
-vector_store = PGVector(
+def collection_override() -> Optional[str]:
+    return _collection_override.get()
+
+
+class AliasedPGVector(PGVector):
+    """
+    PGVector that resolves collection_name through collection_aliases on
+    every lookup, inside the one query PGVector already makes. Swapping the
+    alias row switches all searches and writes at once, with no restart.
+    """
+
+    def __post_init__(self) -> None:
+        # PGVector creates the extension, its tables and the collection
+        # here; that waits for init(), so importing this module does not
+        # touch the database
+        self.EmbeddingStore, self.CollectionStore = _get_embedding_collection_store(
+            self._embedding_length
+        )
+
+    def _make_sync_session(self):
+        init()
+        return super()._make_sync_session()
+
+    def _make_async_session(self):
+        init()
+        return super()._make_async_session()
+
+    def _collection_statement(self):
+        store = self.CollectionStore
+        name = _collection_override.get()
+
+        if name is None:
+            target = (
+                select(collection_aliases.c.collection_name)
+                .where(collection_aliases.c.alias == self.collection_name)
+                .scalar_subquery()
+            )
+            name = func.coalesce(target, self.collection_name)
+
+        return select(store).where(store.name == name)
+
+    def get_collection(self, session):
+        return session.execute(self._collection_statement()).scalars().first()
+
+    async def aget_collection(self, session):
+        # The async store sets up CollectionStore lazily, on its first
+        # PGVector call; helpers that query it directly may come first
+        init()
+        await self.__apost_init__()
+        return (await session.execute(self._collection_statement())).scalars().first()
+
+
+vector_store = AliasedPGVector(
     embeddings=embeddings,
     collection_name=config["vectorstore"]["collection_name"],
-    connection=CONNECTION_STRING,
+    connection=engine,
+    embedding_length=EMBEDDING_DIMENSIONS,
     use_jsonb=True,
 )
+
+# Async twin for the query path
+async_vector_store = AliasedPGVector(
+    embeddings=embeddings,
+    collection_name=config["vectorstore"]["collection_name"],
+    connection=async_engine,
+    embedding_length=EMBEDDING_DIMENSIONS,
+    use_jsonb=True,
+    async_mode=True,
+)
+
+
+# ===============================
+# COLLECTION EMBEDDING MODEL
+# ===============================
+# Every collection version records the model that built it in its
+# cmetadata. Query vectors must come from that model, so searches embed
+# with the model of the collection they resolve to; during a blue/green
+# model change the live version keeps its model until the swap.
+def configured_embedding() -> dict:
+    """
+    cmetadata recorded for collections built by this process
+    """
+    return {
+        "embedding_provider": EMBEDDING_PROVIDER,
+        "embedding_model": EMBEDDING_MODEL,
+        "embedding_dimensions": int(EMBEDDING_DIMENSIONS)
+    }
+
+
+def embedding_record(collection) -> dict:
+    """
+    The model a collection was built with. Collections created before
+    versions recorded it are assumed to use the configured model.
+    """
+    metadata = (collection.cmetadata if collection is not None else None) or {}
+    if "embedding_model" not in metadata:
+        return configured_embedding()
+    return {key: metadata[key] for key in configured_embedding()}
+
+
+def _embeddings_of(collection):
+    record = embedding_record(collection)
+    return embeddings_for(
+        record["embedding_provider"],
+        record["embedding_model"],
+        record["embedding_dimensions"]
+    )
+
+
+def query_embeddings():
+    """
+    Embedder for query vectors: the model of the collection searches
+    resolve to right now (alias target, or use_collection)
+    """
+    with vector_store._make_sync_session() as session:
+        return _embeddings_of(vector_store.get_collection(session))
+
+
+async def aquery_embeddings():
+    """
+    Async version of query_embeddings
+    """
+    async with async_vector_store._make_async_session() as session:
+        return _embeddings_of(await async_vector_store.aget_collection(session))
+
+
+def check_embedding_model(collection_name: Optional[str] = None):
+    """
+    Refuses writes into a collection built with another embedding model
+    than the configured one (default: the live collection) - its stored
+    vectors and the new ones would not be comparable. Re-index into a new
+    version instead.
+    """
+    with vector_store._make_sync_session() as session:
+        collection = _get_collection(session, collection_name)
+        record = embedding_record(collection)
+        name = collection.name if collection else collection_name
+
+    if record != configured_embedding():
+        raise ValueError(
+            f"{name} was built with {record['embedding_model']} "
+            f"({record['embedding_dimensions']} dimensions) but "
+            f"{EMBEDDING_MODEL} is configured; re-index into a new version"
+        )
+
+
+def embedding_column_dimensions() -> Optional[int]:
+    """
+    n of the shared vector(n) column every version stores its vectors in
+    (None / negative before ensure_vector_index typed it)
+    """
+    with vector_store._make_sync_session() as session:
+        return _column_dimensions(session)
+
+
+# ===============================
+# ANN INDEX
+# ===============================
+VECTOR_INDEX = "ix_langchain_pg_embedding_embedding_ann"
+
+# Per-request overrides, e.g. {"hnsw.ef_search": 100}; see ann_search_params
+_search_params: ContextVar[Optional[Dict[str, int]]] = ContextVar(
+    "ann_search_params", default=None
+)
+
+
+def _pgvector_version() -> str:
+    with engine.connect() as connection:
+        return connection.execute(text(
+            "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+        )).scalar()
+
+
+# Read by init()
+PGVECTOR_VERSION: Optional[str] = None
+_PGVECTOR_RELEASE: Tuple[int, ...] = (0, 0)
+
+# Every collection version lives in the one embedding table, so the ANN
+# index holds the rows of all of them. An index scan yields only its
+# ef_search (HNSW) / probed (IVFFlat) candidates, and the collection and
+# metadata conditions are applied to those afterwards: with two versions
+# of similar size roughly half the candidates survive, and a selective
+# filter can leave fewer than k rows or none. pgvector >= 0.8 keeps
+# scanning until enough rows pass (iterative index scans); older releases
+# serve filtered searches exactly instead (see dense_search_with_score).
+# Set by init().
+ITERATIVE_SCAN = False
+
+
+# Quantized modes: the index holds a compressed copy of every vector -
+# half precision (2 bytes per dimension) or one sign bit per dimension -
+# while the table keeps float32, so index candidates are re-ranked at full
+# precision (see dense_search_with_score). Needs pgvector >= 0.7.
+QUANTIZED_INDEXES = {
+    "halfvec": ("(embedding::halfvec({dim}))", "halfvec_cosine_ops"),
+    "bit": ("(binary_quantize(embedding)::bit({dim}))", "bit_hamming_ops"),
+}
+
+
+def vector_index_name(quantization: str) -> str:
+    return VECTOR_INDEX if quantization == "none" else f"{VECTOR_INDEX}_{quantization}"
+
+
+def _vector_index_statement(table: str, quantization: str) -> str:
+    # PGVector ranks by cosine distance -> vector_cosine_ops
+    expression, ops = "embedding", "vector_cosine_ops"
+    if quantization != "none":
+        expression, ops = QUANTIZED_INDEXES[quantization]
+        expression = expression.format(dim=int(EMBEDDING_DIMENSIONS))
+
+    name = vector_index_name(quantization)
+
+    if index_config["type"] == "hnsw":
+        return (
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING hnsw ({expression} {ops}) "
+            f"WITH (m = {int(index_config['m'])}, "
+            f"ef_construction = {int(index_config['ef_construction'])})"
+        )
+
+    if index_config["type"] == "ivfflat":
+        return (
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING ivfflat ({expression} {ops}) "
+            f"WITH (lists = {int(index_config['lists'])})"
+        )
+
+    raise ValueError(f"Unknown vector index type: {index_config['type']}")
+
+
+def _check_quantization_support(quantization: str):
+    if quantization == "none":
+        return
+
+    if quantization not in QUANTIZED_INDEXES:
+        raise ValueError(f"Unknown vector quantization: {quantization}")
+
+    if _PGVECTOR_RELEASE < (0, 7):
+        raise RuntimeError(
+            f"vectorstore.index.quantization: {quantization} needs pgvector >= 0.7 "
+            f"(installed: {PGVECTOR_VERSION})"
+        )
+
+
+def _column_dimensions(session) -> Optional[int]:
+    # atttypmod: n of vector(n), -1 for an untyped column
+    return session.execute(text(
+        "SELECT atttypmod FROM pg_attribute "
+        "WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding'"
+    ), {"table": vector_store.EmbeddingStore.__tablename__}).scalar()
+
+
+def ensure_vector_index(rebuild: bool = False, quantization: Optional[str] = None):
+    """
+    Creates the ANN index on the embedding column (vectorstore.index), or
+    on its quantized form for `quantization` (default: the configured
+    vectorstore.index.quantization).
+    rebuild=True drops every ANN index first - needed after changing the
+    build parameters or the quantization, and for IVFFlat after the
+    collection has grown a lot (its lists are fixed at build time).
+
+    ANN indexes need a typed column; tables created before the store
+    passed embedding_length have an untyped `vector` column and are
+    converted to vector(dimensions) here.
+    """
+    if index_config["type"] == "none":
+        return
+
+    if quantization is None:
+        quantization = index_config["quantization"]
+
+    table = vector_store.EmbeddingStore.__tablename__
+
+    init()
+    _check_quantization_support(quantization)
+
+    with vector_store._make_sync_session() as session:
+        dimensions = _column_dimensions(session)
+
+        if dimensions is not None and dimensions < 0:
+            logger.info(f"Typing {table}.embedding as vector({EMBEDDING_DIMENSIONS})")
+            session.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN embedding "
+                f"TYPE vector({int(EMBEDDING_DIMENSIONS)})"
+            ))
+
+        if rebuild:
+            for mode in ("none", *QUANTIZED_INDEXES):
+                session.execute(text(f"DROP INDEX IF EXISTS {vector_index_name(mode)}"))
+
+        session.execute(text(_vector_index_statement(table, quantization)))
+        session.commit()
+
+
+@contextlib.contextmanager
+def ann_search_params(ef_search: Optional[int] = None, probes: Optional[int] = None):
+    """
+    Overrides the ANN recall/speed trade-off for every vector search
+    issued inside the block (sync or async, including tasks it spawns).
+    Higher values find more true neighbours but scan more of the index.
+    """
+    overrides = {
+        name: int(value)
+        for name, value in (("hnsw.ef_search", ef_search), ("ivfflat.probes", probes))
+        if value
+    }
+
+    token = _search_params.set(overrides or None)
+    try:
+        yield
+    finally:
+        _search_params.reset(token)
+
+
+def _set_default_search_params(dbapi_connection, connection_record):
+    # Session-level defaults, once per pooled connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET hnsw.ef_search = {int(index_config['ef_search'])}")
+    cursor.execute(f"SET ivfflat.probes = {int(index_config['probes'])}")
+    if ITERATIVE_SCAN:
+        # strict_order keeps HNSW results exactly ranked; IVFFlat only
+        # supports relaxed_order, its results are re-sorted by the caller
+        cursor.execute("SET hnsw.iterative_scan = strict_order")
+        cursor.execute("SET ivfflat.iterative_scan = relaxed_order")
+    cursor.close()
+    dbapi_connection.commit()
+
+
+def _apply_search_params(connection):
+    # SET LOCAL ends with the transaction, so the override never leaks
+    # to the next request that gets this pooled connection
+    for name, value in (_search_params.get() or {}).items():
+        connection.exec_driver_sql(f"SET LOCAL {name} = {value}")
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "connect", _set_default_search_params)
+    event.listen(_engine, "begin", _apply_search_params)
+
+
+# ===============================
+# DENSE SEARCH
+# ===============================
+def _quantized_distance(quantization: str, query):
+    # Must match the QUANTIZED_INDEXES expressions for the index to be used
+    store = vector_store.EmbeddingStore
+    dimensions = int(EMBEDDING_DIMENSIONS)
+
+    if quantization == "halfvec":
+        return cast(store.embedding, HALFVEC(dimensions)).op("<=>")(
+            cast(query, HALFVEC(dimensions))
+        )
+
+    # binary_quantize is overloaded (vector / halfvec): type the parameter
+    return cast(func.binary_quantize(store.embedding), BIT(dimensions)).op("<~>")(
+        cast(func.binary_quantize(cast(query, VECTOR(dimensions))), BIT(dimensions))
+    )
+
+
+def _search_conditions(collection_id, filter: Optional[dict] = None) -> list:
+    store = vector_store.EmbeddingStore
+
+    conditions = [store.collection_id == collection_id]
+    if filter:
+        conditions.append(vector_store._create_filter_clause(filter))
+    return conditions
+
+
+def _dense_statement(
+    query_embedding: List[float],
+    k: int,
+    collection_id,
+    filter: Optional[dict] = None
+):
+    """
+    Takes k * rerank_factor candidates from the quantized index, then
+    ranks them by their exact cosine distance
+    """
+    store = vector_store.EmbeddingStore
+    query = literal(query_embedding, store.embedding.type)
+    distance = store.embedding.cosine_distance(query)
+
+    candidates = (
+        select(store.id)
+        .where(*_search_conditions(collection_id, filter))
+        .order_by(_quantized_distance(index_config["quantization"], query))
+        .limit(k * int(index_config["rerank_factor"]))
+    )
+
+    return (
+        select(store, distance.label("distance"))
+        .where(store.id.in_(candidates))
+        .order_by(distance)
+        .limit(k)
+    )
+
+
+def _exact_statement(
+    query_embedding: List[float],
+    k: int,
+    collection_id,
+    filter: Optional[dict] = None
+):
+    """
+    Exact cosine search over the rows matching the collection and filter.
+    Ordering by "distance + 0" keeps the planner off the ANN index, so the
+    rows come from the (collection_id, field) btrees and none are lost to
+    post-filtering.
+    """
+    store = vector_store.EmbeddingStore
+    distance = store.embedding.cosine_distance(literal(query_embedding, store.embedding.type))
+
+    return (
+        select(store, distance.label("distance"))
+        .where(*_search_conditions(collection_id, filter))
+        .order_by(distance + 0)
+        .limit(k)
+    )
+
+
+def _search_statement(query_embedding: List[float], k: int, collection_id, filter):
+    if filter and not ITERATIVE_SCAN:
+        return _exact_statement(query_embedding, k, collection_id, filter)
+    return _dense_statement(query_embedding, k, collection_id, filter)
+
+
+def _use_pgvector_search(filter: Optional[dict]) -> bool:
+    # PGVector's own query when neither quantization nor the exact
+    # filtered path applies
+    return index_config["quantization"] == "none" and (not filter or ITERATIVE_SCAN)
+
+
+def _by_distance(results: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+    # IVFFlat iterative scans (relaxed_order) may return rows slightly out
+    # of order
+    return sorted(results, key=lambda result: result[1])
+
+
+@contextlib.contextmanager
+def _candidate_search_params(candidates: int):
+    # An HNSW scan returns at most ef_search rows; keep it >= the candidates
+    params = _search_params.get() or {}
+    ef_search = max(params.get("hnsw.ef_search", int(index_config["ef_search"])), candidates)
+
+    token = _search_params.set({**params, "hnsw.ef_search": ef_search})
+    try:
+        yield
+    finally:
+        _search_params.reset(token)
+
+
+def dense_search_with_score(
+    query_embedding: List[float],
+    k: int,
+    filter: Optional[dict] = None
+) -> List[Tuple[Document, float]]:
+    """
+    Vector search; scores are cosine distances. With
+    vectorstore.index.quantization set, the quantized index supplies
+    k * rerank_factor candidates that are re-ranked at full precision,
+    otherwise this is PGVector's own search. Filtered searches on
+    pgvector < 0.8 are exact (see ITERATIVE_SCAN).
+    """
+    init()
+    if _use_pgvector_search(filter):
+        return _by_distance(vector_store.similarity_search_with_score_by_vector(
+            embedding=query_embedding, k=k, filter=filter
+        ))
+
+    with _candidate_search_params(k * int(index_config["rerank_factor"])):
+        with vector_store._make_sync_session() as session:
+            collection = vector_store.get_collection(session)
+            if not collection:
+                return []
+
+            results = session.execute(
+                _search_statement(query_embedding, k, collection.uuid, filter)
+            ).all()
+
+    return vector_store._results_to_docs_and_scores(results)
+
+
+async def adense_search_with_score(
+    query_embedding: List[float],
+    k: int,
+    filter: Optional[dict] = None
+) -> List[Tuple[Document, float]]:
+    """
+    Async version of dense_search_with_score
+    """
+    init()
+    if _use_pgvector_search(filter):
+        return _by_distance(await async_vector_store.asimilarity_search_with_score_by_vector(
+            embedding=query_embedding, k=k, filter=filter
+        ))
+
+    with _candidate_search_params(k * int(index_config["rerank_factor"])):
+        async with async_vector_store._make_async_session() as session:
+            collection = await async_vector_store.aget_collection(session)
+            if not collection:
+                return []
+
+            results = (await session.execute(
+                _search_statement(query_embedding, k, collection.uuid, filter)
+            )).all()
+
+    return async_vector_store._results_to_docs_and_scores(results)
+
+
+# ===============================
+# FULL-TEXT (LEXICAL) SEARCH
+# ===============================
+TEXT_SEARCH_CONFIG = config["retrieval"]["hybrid"]["text_search_config"]
+
+# Inlined (not bound), so the query parses with the column's configuration
+_TS_CONFIG = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+
+# Stored (generated) tsvector of each chunk: parsed once on write instead
+# of for every candidate row on every keyword search
+TEXT_SEARCH_COLUMN = "document_tsv"
+
+TEXT_SEARCH_INDEX = "ix_langchain_pg_embedding_document_tsv"
+
+# GIN expression index of the releases before TEXT_SEARCH_COLUMN
+_LEGACY_TEXT_SEARCH_INDEX = "ix_langchain_pg_embedding_document_fts"
+
+
+
+def _ensure_text_search_column():
+    """
+    Migration run by init(): adds TEXT_SEARCH_COLUMN, or re-creates it when
+    text_search_config changed. Filling it rewrites the table under an
+    ACCESS EXCLUSIVE lock, so processes starting together take an advisory
+    lock first and only the first one rewrites; the others find the column
+    in place.
+    """
+    table = vector_store.EmbeddingStore.__tablename__
+    expression = f"to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, coalesce(document, ''))"
+
+    with vector_store._make_sync_session() as session:
+        # Released when the transaction ends
+        session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:name))"),
+            {"name": f"{table}.{TEXT_SEARCH_COLUMN}"}
+        )
+
+        current = session.execute(text(
+            "SELECT generation_expression FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = :column"
+        ), {"table": table, "column": TEXT_SEARCH_COLUMN}).scalar()
+
+        if current is not None and f"'{TEXT_SEARCH_CONFIG}'::regconfig" in current:
+            return
+
+        logger.info(f"Building {table}.{TEXT_SEARCH_COLUMN} ({TEXT_SEARCH_CONFIG})")
+        # Dropping the column also drops its GIN index; ensure_indexes rebuilds it
+        session.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {TEXT_SEARCH_COLUMN}"))
+        session.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN {TEXT_SEARCH_COLUMN} tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        ))
+        session.commit()
+
+
+# Metadata fields retrieval can be scoped by (see RetrievalFilters)
+FILTER_FIELDS = ("plan_name", "product_name", "file_name", "type")
+
+
+# PGVector's own containment index on the metadata
+METADATA_GIN_INDEX = "ix_cmetadata_gin"
+
+
+def ensure_indexes():
+    """
+    Creates the GIN index on TEXT_SEARCH_COLUMN used by
+    keyword_search_with_score and
+    one (collection_id, cmetadata->>'field') btree per filterable field, so
+    filtered searches narrow the rows in SQL before ranking them. `source`
+    is indexed the same way for the per-document delete in replace_documents.
+    """
+    table = vector_store.EmbeddingStore.__tablename__
+
+    statements = [
+        f"DROP INDEX IF EXISTS {_LEGACY_TEXT_SEARCH_INDEX}",
+        f"CREATE INDEX IF NOT EXISTS {TEXT_SEARCH_INDEX} ON {table} "
+        f"USING gin ({TEXT_SEARCH_COLUMN})",
+        f"CREATE INDEX IF NOT EXISTS {METADATA_GIN_INDEX} ON {table} "
+        f"USING gin (cmetadata jsonb_path_ops)"
+    ] + [
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{field} ON {table} "
+        f"(collection_id, (cmetadata ->> '{field}'))"
+        for field in FILTER_FIELDS + ("source",)
+    ]
+
+    with vector_store._make_sync_session() as session:
+        for statement in statements:
+            session.execute(text(statement))
+        session.commit()
+
+
+@contextlib.contextmanager
+def deferred_indexes():
+    """
+    For full rebuilds: drops the indexes that are expensive to maintain row
+    by row (ANN, full-text GIN, metadata GIN) and builds them once when the
+    block exits - also on failure. Searches fall back to sequential scans
+    meanwhile; the cheap btrees stay.
+    """
+    with vector_store._make_sync_session() as session:
+        ann_index = vector_index_name(index_config["quantization"])
+        for index in (ann_index, TEXT_SEARCH_INDEX, METADATA_GIN_INDEX):
+            session.execute(text(f"DROP INDEX IF EXISTS {index}"))
+        session.commit()
+
+    try:
+        yield
+    finally:
+        logger.info("Rebuilding deferred indexes")
+        ensure_indexes()
+        ensure_vector_index()
+
+
+def _keyword_statement(
+    query: str,
+    query_embedding: List[float],
+    k: int,
+    collection_id,
+    filter: Optional[dict] = None
+):
+    """
+    Chunks matching any of the query's words; those matching all of them
+    rank first, then by ts_rank_cd, so chunks that share rare tokens (plan
+    numbers, UIN codes, rider names) come before ones that merely repeat a
+    common word. `filter` is a PGVector metadata filter. Returns None when
+    the query has no searchable words.
+    """
+    # Alphanumeric runs only, so user input can never form tsquery operators
+    terms = list(dict.fromkeys(re.findall(r"[^\W_]+", query.lower())))
+    if not terms:
+        return None
+
+    store = vector_store.EmbeddingStore
+    ts_vector = literal_column(f"{store.__tablename__}.{TEXT_SEARCH_COLUMN}", TSVECTOR)
+    any_terms = func.to_tsquery(_TS_CONFIG, " | ".join(terms))
+    all_terms = func.to_tsquery(_TS_CONFIG, " & ".join(terms))
+
+    conditions = [store.collection_id == collection_id, ts_vector.op("@@")(any_terms)]
+    if filter:
+        conditions.append(vector_store._create_filter_clause(filter))
+
+    return (
+        select(store, store.embedding.cosine_distance(query_embedding).label("distance"))
+        .where(*conditions)
+        .order_by(
+            ts_vector.op("@@")(all_terms).desc(),
+            func.ts_rank_cd(ts_vector, any_terms).desc()
+        )
+        .limit(k)
+    )
+
+
+def keyword_search_with_score(
+    query: str,
+    query_embedding: List[float],
+    k: int,
+    filter: Optional[dict] = None
+) -> List[Tuple[Document, float]]:
+    """
+    Full-text search over chunk text. Scores are cosine distances to
+    query_embedding, same as similarity_search_with_score.
+    """
+    with vector_store._make_sync_session() as session:
+        collection = vector_store.get_collection(session)
+        if not collection:
+            return []
+
+        statement = _keyword_statement(query, query_embedding, k, collection.uuid, filter)
+        if statement is None:
+            return []
+
+        results = session.execute(statement).all()
+
+    return vector_store._results_to_docs_and_scores(results)
+
+
+async def akeyword_search_with_score(
+    query: str,
+    query_embedding: List[float],
+    k: int,
+    filter: Optional[dict] = None
+) -> List[Tuple[Document, float]]:
+    """
+    Async version of keyword_search_with_score
+    """
+    async with async_vector_store._make_async_session() as session:
+        collection = await async_vector_store.aget_collection(session)
+        if not collection:
+            return []
+
+        statement = _keyword_statement(query, query_embedding, k, collection.uuid, filter)
+        if statement is None:
+            return []
+
+        results = (await session.execute(statement)).all()
+
+    return async_vector_store._results_to_docs_and_scores(results)
+
+
+# ===============================
+# STORED VECTORS
+# ===============================
+def _embeddings_statement(ids: List[str]):
+    store = vector_store.EmbeddingStore
+    return select(store.id, store.embedding).where(store.id.in_(ids))
+
+
+def get_embeddings(ids: List[str]) -> Dict[str, List[float]]:
+    """
+    Stored vectors of the given chunk ids (one query), keyed by id
+    """
+    if not ids:
+        return {}
+
+    with vector_store._make_sync_session() as session:
+        rows = session.execute(_embeddings_statement(ids)).all()
+
+    return {str(chunk_id): vector for chunk_id, vector in rows}
+
+
+async def aget_embeddings(ids: List[str]) -> Dict[str, List[float]]:
+    """
+    Async version of get_embeddings
+    """
+    if not ids:
+        return {}
+
+    async with async_vector_store._make_async_session() as session:
+        rows = (await session.execute(_embeddings_statement(ids))).all()
+
+    return {str(chunk_id): vector for chunk_id, vector in rows}
+
+
+# ===============================
+# INGESTION BOOKKEEPING
+# ===============================
+# Bumped by every replace_documents, so "has this collection changed?" is
+# one primary-key lookup instead of a scan of its chunks
+collection_revisions = Table(
+    "langchain_pg_collection_revision",
+    MetaData(),
+    Column("collection_id", UUID(as_uuid=True), primary_key=True),
+    Column("revision", BigInteger, nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False, server_default=func.now())
+)
+
+
+def _bump_revision(session, collection_id):
+    statement = insert(collection_revisions).values(collection_id=collection_id, revision=1)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[collection_revisions.c.collection_id],
+        set_={"revision": collection_revisions.c.revision + 1, "updated_at": func.now()}
+    ))
+
+
+def get_ingested_files(
+    collection_name: Optional[str] = None
+) -> Dict[str, Set[Tuple[str, str]]]:
+    """
+    Maps every stored `source` to its distinct (checksum, document_id) pairs
+    """
+    store = vector_store.EmbeddingStore
+    files = defaultdict(set)
+
+    with vector_store._make_sync_session() as session:
+        collection = _get_collection(session, collection_name)
+        if not collection:
+            return files
+
+        rows = (
+            session.query(
+                store.cmetadata["source"].astext,
+                store.cmetadata["checksum"].astext,
+                store.cmetadata["document_id"].astext,
+            )
+            .filter(store.collection_id == collection.uuid)
+            .distinct()
+            .all()
+        )
+
+    for source, checksum, document_id in rows:
+        files[source].add((checksum, document_id))
+
+    return files
+
+
+def get_checksum_fingerprint() -> str:
+    """
+    Live collection and its ingestion revision. Changes whenever a file is
+    added, replaced or removed, and when the alias is swapped to another
+    collection version.
+    """
+    with vector_store._make_sync_session() as session:
+        collection = vector_store.get_collection(session)
+        if not collection:
+            return ""
+
+        revision = session.execute(
+            select(collection_revisions.c.revision)
+            .where(collection_revisions.c.collection_id == collection.uuid)
+        ).scalar()
+
+    return f"{collection.uuid}:{revision or 0}"
+
+
+# ===============================
+# BULK WRITER
+# ===============================
+COPY_COLUMNS = ("id", "collection_id", "embedding", "document", "cmetadata")
+COPY_TYPES = ["varchar", "uuid", "vector", "varchar", "jsonb"]
+
+_vector_type = None
+
+
+def _copy_cursor(session):
+    """
+    Raw psycopg cursor on the session's connection (same transaction),
+    able to dump numpy arrays as binary pgvector values
+    """
+    global _vector_type
+
+    connection = session.connection().connection.driver_connection
+    if _vector_type is None:
+        _vector_type = TypeInfo.fetch(connection, "vector")
+
+    cursor = connection.cursor()
+    register_vector_info(cursor, _vector_type)
+    return cursor
+
+
+def _copy_documents(session, collection_id, documents, vectors):
+    """
+    Streams one batch through COPY ... (FORMAT BINARY): no per-row INSERT
+    parsing/planning, and vectors travel as float4 arrays instead of text
+    """
+    table = vector_store.EmbeddingStore.__tablename__
+
+    with _copy_cursor(session) as cursor:
+        with cursor.copy(
+            f"COPY {table} ({', '.join(COPY_COLUMNS)}) FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            copy.set_types(COPY_TYPES)
+
+            for d, vector in zip(documents, vectors):
+                copy.write_row((
+                    d.metadata["chunk_id"],
+                    collection_id,
+                    np.asarray(vector, dtype=np.float32),
+                    d.page_content,
+                    Jsonb(d.metadata),
+                ))
+
+
+def _get_collection(session, collection_name: Optional[str]):
+    if collection_name is None:
+        return vector_store.get_collection(session)
+    return vector_store.CollectionStore.get_by_name(session, collection_name)
+
+
+def replace_documents(
+    source: str,
+    batches: Iterable[Tuple[List[Document], List[List[float]]]],
+    collection_name: Optional[str] = None
+) -> Tuple[int, int]:
+    """
+    Swaps every stored chunk of `source` for the already-embedded chunks
+    in `batches` inside one transaction. Batches are COPY-loaded as they
+    arrive, so the whole document never has to be held in memory.
+    Returns (removed, added) chunk counts.
+
+    Chunk metadata is built without validation during ingestion; the
+    schema is checked here, once per document (all chunks of a document
+    share the same shape).
+    """
+    store = vector_store.EmbeddingStore
+    added = 0
+
+    with vector_store._make_sync_session() as session:
+        collection = _get_collection(session, collection_name)
+        if not collection:
+            raise ValueError("Collection not found")
+
+        removed = session.execute(
+            delete(store).where(
+                store.collection_id == collection.uuid,
+                store.cmetadata["source"].astext == source,
+            )
+        ).rowcount
+
+        for documents, vectors in batches:
+            if not documents:
+                continue
+
+            if not added:
+                ChunkMetadata.model_validate(documents[0].metadata)
+
+            _copy_documents(session, collection.uuid, documents, vectors)
+            added += len(documents)
+
+        # Last, so the revision row stays locked only for the commit
+        _bump_revision(session, collection.uuid)
+        session.commit()
+
+    return removed, added
+
+
+# ===============================
+# SETUP
+# ===============================
+_setup_lock = threading.RLock()
+_initialized = False
+_initializing = False
+
+
+def init():
+    """
+    Prepares the database for the stores: pgvector extension, PGVector's
+    tables and collection, the alias / revision tables and the full-text
+    column, and reads the pgvector version. Importing this module does
+    none of it - spawned parser processes re-import the entry point and
+    must stay off the database - so the API lifespan and the ingest CLI
+    call init() at start-up; the first session opens it otherwise.
+    Idempotent.
+    """
+    global _initialized, _initializing, PGVECTOR_VERSION, _PGVECTOR_RELEASE, ITERATIVE_SCAN
+
+    if _initialized:
+        return
+
+    with _setup_lock:
+        # _initializing: re-entered from the sessions opened below
+        if _initialized or _initializing:
+            return
+
+        _initializing = True
+        try:
+            PGVector.__post_init__(vector_store)
+            collection_aliases.create(engine, checkfirst=True)
+            collection_revisions.create(engine, checkfirst=True)
+
+            PGVECTOR_VERSION = _pgvector_version()
+            _PGVECTOR_RELEASE = tuple(int(part) for part in PGVECTOR_VERSION.split(".")[:2])
+            ITERATIVE_SCAN = _PGVECTOR_RELEASE >= (0, 8)
+
+            _ensure_text_search_column()
+        finally:
+            _initializing = False
+
+        # The connections opened above predate the version check; drop them
+        # so every pooled connection goes through the connect hook
+        engine.dispose()
+        _initialized = True